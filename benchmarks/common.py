@@ -0,0 +1,76 @@
+"""
+Helpers shared by the benchmark scripts
+"""
+
+import sys
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+class NullTransport:
+    """Email transport that drops every message. Keeps the notifier off the network during benchmarks"""
+    def __init__(self):
+        self.sent = 0
+
+    def send_message(self, msg):
+        self.sent += 1
+
+    def close(self):
+        pass
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the current process in MB, or None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def percentile(values: list[float], q: float) -> float:
+    """Linear-interpolated percentile (q in [0, 100]) of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+def run_isolated(fn: Callable, *args, **kwargs):
+    """
+    Run fn in a fresh process so peak RSS reflects that run only
+
+    <INPUTS>
+    fn: Module-level function to run (must be picklable)
+    args/kwargs: Passed through to fn
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(fn, *args, **kwargs).result()
+
+def print_table(rows: list[dict], columns: list[str]):
+    """Print rows as a fixed-width table"""
+    widths = {c: max(len(c), *(len(_fmt(r.get(c))) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    print("  ".join("-" * widths[c] for c in columns))
+    for r in rows:
+        print("  ".join(_fmt(r.get(c)).ljust(widths[c]) for c in columns))
+
+def write_json(rows: list[dict], path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=2)
+    print(f"Results written to {path}")
+
+def _fmt(value) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:,.3f}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
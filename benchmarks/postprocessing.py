@@ -0,0 +1,195 @@
+"""
+Micro-benchmarks for the post-processing path on synthetic data:
+compute_statistics, annotate_stats_with_intervals, annotate_stats_with_agreement, print_summary, save_results
+and parse_summary.parse_summary
+
+Usage: python -m benchmarks.postprocessing [--sizes 10k,100k,1M,5M] [--log-sizes 10,100,500] [--memory] [--json out.json]
+Sizes are annotation rows (one row per classifier per sample). Log sizes are in MB.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from types import SimpleNamespace
+from typing import Callable
+
+from benchmarks.common import peak_rss_mb, run_isolated, print_table, write_json
+
+LANGUAGES = ["en", "es", "zh", "ar"]
+CLASSIFIERS = ["claude-sonnet-4-6", "gpt-5.2-2025-12-11", "deepseek-chat", "grok-4-1-fast-reasoning"]
+ROLES = ["perpetrator", "victim", "hero", "expert", "bystander", "other"]
+SENTIMENTS = ["positive", "negative", "neutral"]
+
+def _parse_size(value: str) -> int:
+    value = value.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(value[-1], 1)
+    return int(float(value.rstrip("km")) * multiplier)
+
+def make_results(rows: int, scenarios: int = 15, vocabulary: int = 500, response_chars: int = 300, seed: int = 0) -> list:
+    """
+    Build a synthetic list of AnnotatedResponse shaped like a real run
+
+    <INPUTS>
+    rows: Number of annotations to generate
+    scenarios: Number of distinct scenarios
+    vocabulary: Number of distinct group labels. Drawn with a long tail like real classifier output
+    response_chars: Length of each raw_response
+    seed: Random seed
+    """
+    from utilities.data_structures import AnnotatedResponse
+
+    rng = random.Random(seed)
+    groups = [f"group_{i}" for i in range(vocabulary)]
+    weights = [1 / (i + 1) for i in range(vocabulary)]
+    filler = "x" * response_chars
+
+    per_sample = len(CLASSIFIERS)
+    cells = [(f"scenario_{s}", lang) for s in range(scenarios) for lang in LANGUAGES]
+    samples_per_cell = max(1, -(-rows // (per_sample * len(cells))))
+
+    results = []
+    for scenario, language in cells:
+        for sample_index in range(samples_per_cell):
+            raw_response = f"{scenario}/{language}/{sample_index} {filler}"
+            is_refusal = rng.random() < 0.05
+            for classifier in CLASSIFIERS:
+                mentioned = [] if is_refusal else list(dict.fromkeys(rng.choices(groups, weights=weights, k=rng.randint(2, 8))))
+                results.append(AnnotatedResponse(
+                    classifier=classifier,
+                    scenario=scenario,
+                    language=language,
+                    sample_index=sample_index,
+                    raw_response=raw_response,
+                    groups_mentioned=mentioned,
+                    roles={g: rng.choice(ROLES) for g in mentioned},
+                    sentiment={g: rng.choice(SENTIMENTS) for g in mentioned},
+                    notes="synthetic",
+                    is_refusal=is_refusal,
+                    classifier_raw="{}"
+                ))
+                if len(results) >= rows:
+                    return results
+    return results
+
+def make_log(path: str, megabytes: float, seed: int = 0):
+    """Write a synthetic .out log of about the given size in the print_summary format"""
+    rng = random.Random(seed)
+    target = int(megabytes * 1024 * 1024)
+    written = 0
+    block = 0
+
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target:
+            lines = [f"\nScenario: SCENARIO_{block}"]
+            for lang in LANGUAGES:
+                lines.append(f"Language: {lang}")
+                lines.append("Samples: 25 | Refusal rate: 4.0%")
+                for g in range(60):
+                    lines.append(
+                        f"     group_{g} (inferred): mention_rate={rng.uniform(0, 100):.1f}%, "
+                        f"classifier_agreement={rng.uniform(0, 100):.1f}%, "
+                        f"top_role={rng.choice(ROLES)}, top_sentiment={rng.choice(SENTIMENTS)}"
+                    )
+            text = "\n".join(lines) + "\n"
+            f.write(text)
+            written += len(text.encode("utf-8"))
+            block += 1
+
+def _measure(fn: Callable, memory: bool) -> tuple[float, float]:
+    """Return (seconds, tracemalloc peak MB or None) for one call of fn"""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    return elapsed, peak
+
+def bench_results(rows: int, memory: bool, seed: int) -> list[dict]:
+    """Benchmark the functions that consume AnnotatedResponse lists. Meant to run in its own process"""
+    from utilities.utility_functions import compute_statistics, print_summary, save_results
+    from utilities.significance import annotate_stats_with_intervals
+    from utilities.agreement import annotate_stats_with_agreement
+
+    start = time.perf_counter()
+    results = make_results(rows, seed=seed)
+    print(f"[BENCHMARK] Generated {len(results):,} rows in {time.perf_counter() - start:.1f}s")
+
+    stats = compute_statistics(results)
+    agreement = {}
+    model = SimpleNamespace(samples_per_prompt=max(r.sample_index for r in results) + 1, target_model="synthetic", target_model_temperature=1.0, target_model_max_tokens=2048)
+    classifiers = [
+        SimpleNamespace(target_model=c, target_model_temperature=0.0, target_model_max_tokens=1024, system_prompt="",
+                        classify_calls=0, call_failures=0, parse_failures=0, parse_failure_rate=lambda: 0.0)
+        for c in CLASSIFIERS
+    ]
+
+    out = []
+    with tempfile.TemporaryDirectory() as output_dir, open(os.devnull, "w", encoding="utf-8") as devnull:
+        # Annotated in place first, so print_summary and save_results see the stats a run writes
+        cases = {
+            "compute_statistics": lambda: compute_statistics(results),
+            "annotate_stats_with_intervals": lambda: annotate_stats_with_intervals(stats, results, seed=seed),
+            "annotate_stats_with_agreement": lambda: agreement.update(annotate_stats_with_agreement(stats, results)),
+            "print_summary": lambda: print_summary(stats),
+            "save_results": lambda: save_results(results=results, stats=stats, output_dir=output_dir, filename="bench.json", model=model, classifiers=classifiers, agreement=agreement),
+        }
+        for name, fn in cases.items():
+            with contextlib.redirect_stdout(devnull):
+                elapsed, peak = _measure(fn, memory)
+            out.append({"function": name, "input": f"{len(results):,} rows", "seconds": elapsed, "rows_per_s": len(results) / elapsed if elapsed else 0.0, "tracemalloc_peak_mb": peak, "peak_rss_mb": peak_rss_mb()})
+    return out
+
+def bench_log(megabytes: float, memory: bool, seed: int) -> list[dict]:
+    """Benchmark parse_summary on a synthetic log. Meant to run in its own process"""
+    from utilities.parse_summary import parse_summary
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.out")
+        make_log(path, megabytes, seed=seed)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+
+        parsed = {}
+        elapsed, peak = _measure(lambda: parsed.update(rows=parse_summary(path)), memory)
+
+    return [{"function": "parse_summary", "input": f"{size_mb:,.0f} MB log", "seconds": elapsed, "rows_per_s": len(parsed["rows"]) / elapsed if elapsed else 0.0, "tracemalloc_peak_mb": peak, "peak_rss_mb": peak_rss_mb()}]
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the post-processing path")
+    parser.add_argument("--sizes", default="10k,100k,1M", help="Comma separated annotation counts, e.g. 10k,100k,1M,5M")
+    parser.add_argument("--log-sizes", default="10,100", help="Comma separated log sizes in MB, e.g. 10,100,500")
+    parser.add_argument("--memory", action="store_true", help="Also measure tracemalloc peak (runs each function a second time)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Optional path to write results as JSON")
+    args = parser.parse_args()
+
+    rows = []
+    for size in [_parse_size(s) for s in args.sizes.split(",") if s]:
+        print(f"[BENCHMARK] {size:,} annotation rows")
+        rows.extend(run_isolated(bench_results, size, args.memory, args.seed))
+
+    for megabytes in [float(s) for s in args.log_sizes.split(",") if s]:
+        print(f"[BENCHMARK] {megabytes:,.0f} MB log")
+        rows.extend(run_isolated(bench_log, megabytes, args.memory, args.seed))
+
+    if not rows:
+        print("Warning: nothing to benchmark")
+        sys.exit(1)
+
+    print()
+    print_table(rows, ["function", "input", "seconds", "rows_per_s", "tracemalloc_peak_mb", "peak_rss_mb"])
+
+    if args.json:
+        write_json(rows, args.json)
+
+if __name__ == "__main__":
+    main()
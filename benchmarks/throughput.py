@@ -0,0 +1,211 @@
+"""
+End-to-end throughput benchmark for run_experiments using FakeExperiment providers.
+No network calls are made, so runs are free and repeatable for a given seed.
+
+Usage: python -m benchmarks.throughput [--grids 2x4x5,5x4x10] [--paths sequential] [--json out.json]
+Grid format is <scenarios>x<languages>x<samples per prompt>
+"""
+
+import re
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+
+from benchmarks.common import NullTransport, peak_rss_mb, percentile, run_isolated, print_table, write_json
+
+LANGUAGES = ["en", "es", "zh", "ar", "fr", "de", "ja", "hi"]
+
+STORY_PATTERN = re.compile(r"fake story #(\d+)", re.IGNORECASE)
+
+def _build_prompts(n_scenarios: int, n_languages: int) -> dict[str, dict[str, str]]:
+    return {
+        f"scenario_{s}": {
+            LANGUAGES[l] if l < len(LANGUAGES) else f"lang_{l}": f"Write a short story for scenario {s}."
+            for l in range(n_languages)
+        }
+        for s in range(n_scenarios)
+    }
+
+def _build_models(prompts: dict, samples: int, settings: dict):
+    from models.FakeExperiment import FakeExperiment, DEFAULT_CLASSIFICATION
+
+    model = FakeExperiment(
+        prompts=prompts,
+        api_key="fake",
+        target_model="fake-target",
+        samples_per_prompt=samples,
+        target_model_temperature=1.0,
+        target_model_max_tokens=2048,
+        system_prompt="",
+        latency_median=settings["target_latency"],
+        latency_sigma=settings["latency_sigma"],
+        error_rate=settings["error_rate"],
+        rate_limit_rate=settings["rate_limit_rate"],
+        refusal_rate=settings["refusal_rate"],
+        seed=settings["seed"]
+    )
+
+    classifiers = [
+        FakeExperiment(
+            prompts=[],
+            api_key="fake",
+            target_model=f"fake-classifier-{i}",
+            samples_per_prompt=0,
+            target_model_temperature=0.0,
+            target_model_max_tokens=1024,
+            system_prompt="",
+            latency_median=settings["classifier_latency"],
+            latency_sigma=settings["latency_sigma"],
+            error_rate=settings["error_rate"],
+            rate_limit_rate=settings["rate_limit_rate"],
+            classification=DEFAULT_CLASSIFICATION,
+            seed=settings["seed"] + i + 1
+        )
+        for i in range(settings["classifiers"])
+    ]
+    return model, classifiers
+
+def _sequential(model, classifiers, notifier, output_dir: str, settings: dict, generation_batch_size: int = 1):
+    from utilities.utility_functions import run_experiments
+
+    run_experiments(
+        model=model,
+        classifiers=classifiers,
+        notifier=notifier,
+        prefix="Benchmark",
+        log_dir=None,
+        log_filename=None,
+        output_dir=output_dir,
+        output_filename="benchmark.json",
+        rate_limit_delay=settings["rate_limit_delay"],
+        generation_batch_size=generation_batch_size
+    )
+
+def _sequential_hedged(model, classifiers, notifier, output_dir: str, settings: dict):
+    from utilities.HedgingPolicy import HedgingPolicy
+
+    hedging = HedgingPolicy(min_delay=0.0)
+    for classifier in classifiers:
+        classifier.hedging = hedging
+    _sequential(model, classifiers, notifier, output_dir, settings)
+
+def _sequential_batched(model, classifiers, notifier, output_dir: str, settings: dict):
+    # FakeExperiment has no n parameter, so each batch is parallel single calls
+    _sequential(model, classifiers, notifier, output_dir, settings, generation_batch_size=settings["generation_batch"])
+
+# Orchestration paths to compare. Each takes (model, classifiers, notifier, output_dir, settings)
+PATHS = {
+    "sequential": _sequential,
+    "sequential_hedged": _sequential_hedged,
+    "sequential_batched": _sequential_batched,
+}
+
+def _sample_latencies(model, classifiers) -> list[float]:
+    """
+    Per-sample latency from the start of the generation call to the last classifier response.
+    Classifier calls are matched to the story they annotate through the embedded call number.
+    """
+    finished: dict[int, float] = {}
+    for classifier in classifiers:
+        for _, _, end, content, _ in classifier.call_log:
+            m = STORY_PATTERN.search(content)
+            if m:
+                story = int(m.group(1))
+                finished[story] = max(finished.get(story, 0.0), end)
+
+    return [
+        max(end, finished.get(call_number, end)) - start
+        for call_number, start, end, _, _ in model.call_log
+    ]
+
+def run_case(path: str, grid: tuple[int, int, int], settings: dict) -> dict:
+    """Run one (path, grid) combination and return its metrics. Meant to run in its own process"""
+    from utilities.EmailNotifier import EmailNotifer
+
+    n_scenarios, n_languages, samples = grid
+    prompts = _build_prompts(n_scenarios, n_languages)
+    model, classifiers = _build_models(prompts, samples, settings)
+    notifier = EmailNotifer(gmail_address="bench@example.com", app_password="", transport=NullTransport())
+
+    with tempfile.TemporaryDirectory() as output_dir, open(os.devnull, "w", encoding="utf-8") as devnull:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(devnull):
+            PATHS[path](model, classifiers, notifier, output_dir, settings)
+            elapsed = time.perf_counter() - start
+            notifier.close()
+
+    n_samples = n_scenarios * n_languages * samples
+    latencies = _sample_latencies(model, classifiers)
+    return {
+        "path": path,
+        "grid": f"{n_scenarios}x{n_languages}x{samples}",
+        "samples": n_samples,
+        "generation_calls": len(model.call_log),
+        "classifier_calls": sum(len(c.call_log) for c in classifiers),
+        "elapsed_s": elapsed,
+        "samples_per_s": n_samples / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+def _parse_grid(value: str) -> tuple[int, int, int]:
+    parts = value.lower().split("x")
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError(f"Grid '{value}' must look like <scenarios>x<languages>x<samples>")
+    return tuple(int(p) for p in parts)
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput benchmark for run_experiments on fake providers")
+    parser.add_argument("--grids", default="2x4x5,5x4x10", help="Comma separated grid sizes, e.g. 2x4x5,15x4x25")
+    parser.add_argument("--paths", default=",".join(PATHS), help=f"Comma separated paths from {list(PATHS)}")
+    parser.add_argument("--classifiers", type=int, default=4)
+    parser.add_argument("--target-latency", type=float, default=0.02, help="Median target latency in seconds")
+    parser.add_argument("--classifier-latency", type=float, default=0.01, help="Median classifier latency in seconds")
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--refusal-rate", type=float, default=0.05)
+    parser.add_argument("--rate-limit-delay", type=float, default=0.0, help="Sleep between samples (run_experiments default is 0.5)")
+    parser.add_argument("--generation-batch", type=int, default=5, help="Completions requested together on the sequential_batched path")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Optional path to write results as JSON")
+    args = parser.parse_args()
+
+    grids = [_parse_grid(g) for g in args.grids.split(",") if g]
+    paths = [p for p in args.paths.split(",") if p]
+    unknown = [p for p in paths if p not in PATHS]
+    if unknown:
+        print(f"[ERROR] Unknown paths {unknown}. Valid options: {list(PATHS)}")
+        sys.exit(1)
+
+    settings = {
+        "classifiers": args.classifiers,
+        "target_latency": args.target_latency,
+        "classifier_latency": args.classifier_latency,
+        "latency_sigma": args.latency_sigma,
+        "error_rate": args.error_rate,
+        "rate_limit_rate": args.rate_limit_rate,
+        "refusal_rate": args.refusal_rate,
+        "rate_limit_delay": args.rate_limit_delay,
+        "generation_batch": args.generation_batch,
+        "seed": args.seed
+    }
+
+    rows = []
+    for grid in grids:
+        for path in paths:
+            print(f"[BENCHMARK] path={path} grid={'x'.join(map(str, grid))}")
+            rows.append(run_isolated(run_case, path, grid, settings))
+
+    print()
+    print_table(rows, ["path", "grid", "samples", "generation_calls", "classifier_calls", "elapsed_s", "samples_per_s", "p50_ms", "p95_ms", "peak_rss_mb"])
+
+    if args.json:
+        write_json(rows, args.json)
+
+if __name__ == "__main__":
+    main()
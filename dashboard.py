@@ -0,0 +1,124 @@
+"""
+Live terminal dashboard for running experiments
+Reads the progress files every main.py process publishes (one per model, see ProgressReporter)
+and shows throughput, ETA, classifier calls in flight and error/refusal rates per model and overall
+
+Usage: python dashboard.py [--dir progress] [--interval 2] [--once]
+"""
+
+import os
+import json
+import time
+import argparse
+from collections import deque
+from datetime import datetime
+
+# Throughput is measured over this many seconds of recent progress
+RATE_WINDOW = 300.0
+
+# A running process that has not written for this long is shown as stale
+STALE_AFTER = 60.0
+
+def read_progress(progress_dir: str) -> list[dict]:
+    states = []
+    if not os.path.isdir(progress_dir):
+        return states
+    for name in sorted(os.listdir(progress_dir)):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(progress_dir, name), "r", encoding="utf-8") as f:
+                states.append(json.load(f))
+        except (OSError, ValueError):
+            # Being replaced right now, picked up on the next refresh
+            continue
+    return states
+
+def _rate(history: deque, state: dict) -> float:
+    """Samples per second over the recent window, or since the start while the window is still filling"""
+    if len(history) >= 2 and history[-1][0] - history[0][0] >= 10:
+        (t0, s0), (t1, s1) = history[0], history[-1]
+        return (s1 - s0) / (t1 - t0)
+    elapsed = state["updated_at"] - state["started_at"]
+    return state["samples_done"] / elapsed if elapsed > 0 else 0.0
+
+def _duration(seconds: float) -> str:
+    if seconds is None:
+        return "-"
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}h{rest // 60:02d}m{rest % 60:02d}s"
+
+def _percent(part: int, whole: int) -> str:
+    return f"{part / whole:.1%}" if whole else "-"
+
+def render(states: list[dict], histories: dict[str, deque]) -> str:
+    now = time.time()
+    lines = [
+        f"Experiment progress  {datetime.now().strftime('%m/%d/%Y %H:%M:%S')}",
+        "",
+        f"{'Model':<22}{'Status':<10}{'Done':>12}{'%':>7}{'Samples/s':>11}{'ETA':>12}{'In flight':>11}{'Gen err':>9}{'Cls err':>9}{'Refusal':>9}{'Held':>6}  Cell"
+    ]
+
+    total_done = total_samples = 0
+    total_rate = 0.0
+    etas = []
+    for state in states:
+        prefix = state["prefix"]
+        history = histories.setdefault(prefix, deque())
+        if not history or history[-1][0] != state["updated_at"]:
+            history.append((state["updated_at"], state["samples_done"]))
+        while history and history[-1][0] - history[0][0] > RATE_WINDOW:
+            history.popleft()
+
+        status = state["status"]
+        if status == "running" and now - state["updated_at"] > STALE_AFTER:
+            status = "stale"
+
+        done, total = state["samples_done"], state["total_samples"]
+        rate = _rate(history, state) if status == "running" else 0.0
+        eta = (total - done) / rate if rate > 0 else None
+        if status == "running":
+            total_rate += rate
+            etas.append(eta)
+        total_done += done
+        total_samples += total
+
+        lines.append(
+            f"{prefix:<22}{status:<10}{f'{done}/{total}':>12}{_percent(done, total):>7}{rate:>11.3f}{_duration(eta):>12}"
+            f"{state['classifier_in_flight']:>11}{_percent(state['generation_errors'], done):>9}"
+            f"{_percent(state['classifier_errors'], state['classifier_calls']):>9}{_percent(state['refusals'], state['samples_classified']):>9}"
+            f"{state['held']:>6}  {state['scenario']}/{state['language']}"
+        )
+
+    # Models run in parallel under the launcher, so the slowest one finishes the run
+    overall_eta = None if not etas or None in etas else max(etas)
+    lines += [
+        "",
+        f"{'Overall':<22}{'':<10}{f'{total_done}/{total_samples}':>12}{_percent(total_done, total_samples):>7}{total_rate:>11.3f}{_duration(overall_eta):>12}"
+    ]
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Live progress across all running model processes")
+    parser.add_argument("--dir", default="progress", help="Progress directory written by main.py")
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds between refreshes")
+    parser.add_argument("--once", action="store_true", help="Print once and exit")
+    args = parser.parse_args()
+
+    histories: dict[str, deque] = {}
+    try:
+        while True:
+            states = read_progress(args.dir)
+            screen = render(states, histories) if states else f"No progress files in {args.dir}/ yet"
+            if args.once:
+                print(screen)
+                return
+            # Redraw in place; the launcher's terminals are cmd windows, so no ANSI escapes
+            os.system("cls" if os.name == "nt" else "clear")
+            print(screen, flush=True)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
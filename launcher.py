@@ -27,6 +27,7 @@ def main():
         subprocess.Popen(cmd, shell=True)
 
     print(f"[LAUNCHER] Spawned {len(MODELS)} terminals.")
+    print(f"[LAUNCHER] Follow progress with: {sys.executable} dashboard.py")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
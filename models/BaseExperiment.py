@@ -1,9 +1,25 @@
-import json
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from abc import ABC, abstractmethod
+from typing import Optional
+from utilities.classifier_parsing import parse_classifier_output
+from utilities.HedgingPolicy import HedgingPolicy
+from utilities.CircuitBreaker import CircuitBreakerRegistry, CircuitOpenError
+from utilities.Tracer import tracer
+
+# Error text of a provider refusing more than one completion per request (OpenAI-style n, Gemini candidate_count)
+_MULTIPLE_COMPLETIONS_REJECTED = re.compile(
+    r"candidate_?count|multiple (choices|candidates)|number of (choices|candidates)|['\"`]n['\"`]|\bn\b\s*(must|should|is not|>|=)",
+    re.IGNORECASE
+)
 
 class BaseExperiment(ABC):
+    # Providers with a multi-completion request set this and implement
+    # _call_model_batch(model, system_prompt, user_content, temperature, max_tokens, n) -> list[str]
+    supports_batch = False
+
     def __init__(
             self,
             prompts: dict[str, dict[str, str]],
@@ -14,6 +30,9 @@ class BaseExperiment(ABC):
             target_model_temperature: float,
             target_model_max_tokens: int,
             system_prompt: str,
+
+            hedging: Optional[HedgingPolicy] = None,
+            breakers: Optional[CircuitBreakerRegistry] = None,
     ):
         self.scenario_prompts = prompts
         self.api_key = api_key
@@ -24,6 +43,21 @@ class BaseExperiment(ABC):
         self.target_model_max_tokens = target_model_max_tokens
         self.system_prompt = system_prompt
 
+        # Optional hedged requests for classifier calls
+        self.hedging = hedging
+
+        # Multi-completion requests when the provider has them. Cleared if this model rejects them
+        self.batch_generation = self.supports_batch
+
+        # Optional circuit breaker, shared with every experiment on the same provider/model
+        self.breaker = breakers.get(self.latency_key()) if breakers else None
+
+        # Classifier health counters, reported per run
+        self.classify_calls = 0
+        self.call_failures = 0
+        self.parse_failures = 0
+        self._counter_lock = threading.Lock()
+
         self.client = self._build_client()
 
     def __str__(self):
@@ -57,39 +91,186 @@ class BaseExperiment(ABC):
     ) -> str:
         """Make an API call and return raw text response"""
 
+    def _call_classifier(
+        self,
+        model: str,
+        system_prompt: str,
+        user_content: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """
+        Make a classifier API call and return the raw JSON text.
+        Providers override this to use their structured output or tool calling mode.
+        """
+        return self._call_model(
+            model=model,
+            system_prompt=system_prompt,
+            user_content=user_content,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+
+    def _count(self, counter: str):
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def reset_counters(self):
+        """Zero the classifier health counters"""
+        with self._counter_lock:
+            self.classify_calls = 0
+            self.call_failures = 0
+            self.parse_failures = 0
+
+    def parse_failure_rate(self) -> float:
+        """Fraction of successful classifier calls whose output could not be parsed"""
+        completed = self.classify_calls - self.call_failures
+        return self.parse_failures / completed if completed else 0.0
+
     def generate_response(self, prompt: str, sample_index: int) -> str:
+        """
+        Generate one response. Returns "" on API errors.
+        Raises CircuitOpenError without calling the API while this provider's circuit is open.
+        """
+        if self.breaker:
+            self.breaker.acquire()
+
         try:
-            return self._call_model(
-                model=self.target_model,
-                system_prompt=self.system_prompt,
-                user_content=prompt,
-                temperature=self.target_model_temperature,
-                max_tokens=self.target_model_max_tokens
-            )
+            with tracer.span("generate", "api", model=self.target_model, sample=sample_index):
+                response = self._call_model(
+                    model=self.target_model,
+                    system_prompt=self.system_prompt,
+                    user_content=prompt,
+                    temperature=self.target_model_temperature,
+                    max_tokens=self.target_model_max_tokens
+                )
         except Exception as e:
+            if self.breaker:
+                self.breaker.record_failure()
             print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [{self._provider_name().upper()} API ERROR] {sample_index}: {e}")
             return ""
-        
+
+        if self.breaker:
+            self.breaker.record_success()
+        return response
+
+    def generate_responses(self, prompt: str, start_index: int, count: int) -> list[Optional[str]]:
+        """
+        Generate count responses for sample indices start_index .. start_index + count - 1.
+        Uses one multi-completion request where the provider supports it and parallel single calls otherwise
+        (or for whatever the batch did not return). Failed calls give "" as in generate_response().
+
+        <OUTPUTS>
+        One entry per sample index. None where the call was held because this provider's circuit is open
+        """
+        texts: list[Optional[str]] = []
+
+        if count > 1 and self.batch_generation:
+            try:
+                if self.breaker:
+                    self.breaker.acquire()
+                try:
+                    with tracer.span("generate_batch", "api", model=self.target_model, sample=start_index, n=count):
+                        batch = self._call_model_batch(
+                            model=self.target_model,
+                            system_prompt=self.system_prompt,
+                            user_content=prompt,
+                            temperature=self.target_model_temperature,
+                            max_tokens=self.target_model_max_tokens,
+                            n=count
+                        )
+                except Exception as e:
+                    print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [{self._provider_name().upper()} API ERROR] {start_index}-{start_index + count - 1}: {e}")
+                    if self._rejects_multiple_completions(e):
+                        # The provider answered; this model just does not take n > 1, so stop asking
+                        print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [EXPERIMENT] {self.target_model} rejects multiple completions, using single calls")
+                        self.batch_generation = False
+                        if self.breaker:
+                            self.breaker.record_success()
+                    elif self.breaker:
+                        self.breaker.record_failure()
+                    # Either way the batch is retried below as single calls
+                    batch = []
+                else:
+                    if self.breaker:
+                        self.breaker.record_success()
+                texts = [text or "" for text in batch[:count]]
+            except CircuitOpenError:
+                return [None] * count
+
+        remaining = range(start_index + len(texts), start_index + count)
+        if not remaining:
+            return texts
+
+        def single(sample_index: int) -> Optional[str]:
+            try:
+                return self.generate_response(prompt, sample_index)
+            except CircuitOpenError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=len(remaining)) as pool:
+            texts.extend(pool.map(single, remaining))
+        return texts
+
+    @staticmethod
+    def _rejects_multiple_completions(e: Exception) -> bool:
+        """True when a batch call failed because the model does not accept more than one completion per request"""
+        if getattr(e, "status_code", getattr(e, "code", None)) not in (400, 422):
+            return False
+        if getattr(e, "param", None) in ("n", "candidate_count", "candidateCount"):
+            return True
+        return _MULTIPLE_COMPLETIONS_REJECTED.search(str(e)) is not None
+
+    def latency_key(self) -> tuple[str, str]:
+        """Key used to track this provider/model's latency"""
+        return (self._provider_name(), self.target_model)
+
     def classify_response(self, text: str) -> tuple[list[str], dict, dict, str, bool, str]:
-        try:
-            raw = self._call_model(
+        """
+        Classify one response.
+        Raises CircuitOpenError without calling the API while this provider's circuit is open.
+        """
+        if self.breaker:
+            self.breaker.acquire()
+        self._count("classify_calls")
+
+        def call() -> str:
+            return self._call_classifier(
                 model=self.target_model,
                 system_prompt=self.system_prompt,
                 user_content=f"Text to annotate:\n\n{text}",
                 temperature=self.target_model_temperature,
                 max_tokens=self.target_model_max_tokens
             )
-            raw = re.sub(f"^```(?:json)?\s*", "", raw.strip())
-            raw = re.sub(r"\s*```$", "", raw)
-            parsed = json.loads(raw)
-            return (
-                parsed.get("groups_mentioned", []),
-                parsed.get("roles", {}),
-                parsed.get("sentiment", {}),
-                parsed.get("notes", ""),
-                parsed.get("is_refusal", False),
-                raw
-            )
+
+        try:
+            with tracer.span("classifier_call", "api", model=self.target_model, hedged=self.hedging is not None):
+                raw = self.hedging.call(self.latency_key(), call) if self.hedging else call()
         except Exception as e:
+            self._count("call_failures")
+            if self.breaker:
+                self.breaker.record_failure()
             print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [CLASSIFIER ERROR]: {e}")
-            return [], {}, {}, "", False, e
\ No newline at end of file
+            return [], {}, {}, "", False, str(e)
+
+        # The provider answered, even if the output does not parse
+        if self.breaker:
+            self.breaker.record_success()
+
+        try:
+            with tracer.span("parse", "classifier", model=self.target_model):
+                parsed = parse_classifier_output(raw or "")
+        except Exception as e:
+            # Keep the paid output so it can be re-parsed later
+            self._count("parse_failures")
+            print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [CLASSIFIER PARSE ERROR] {self.target_model}: {e}")
+            return [], {}, {}, "", False, raw or ""
+
+        return (
+            parsed.groups_mentioned,
+            parsed.roles,
+            parsed.sentiment,
+            parsed.notes,
+            parsed.is_refusal,
+            raw
+        )
@@ -1,5 +1,6 @@
 from openai import OpenAI
 from models.BaseExperiment import BaseExperiment
+from utilities.classifier_parsing import CLASSIFIER_JSON_SCHEMA
 
 class ChatGPTExperiment(BaseExperiment):
     def _provider_name(self):
@@ -21,4 +22,28 @@ class ChatGPTExperiment(BaseExperiment):
                 }
             ]
         )
+        return message.output_text
+
+    def _call_classifier(self, model, system_prompt, user_content, temperature, max_tokens) -> str:
+        # Non-strict schema since roles/sentiment are keyed by free-form group names
+        message = self.client.responses.create(
+            model=model,
+            max_output_tokens=max_tokens,
+            temperature=temperature,
+            instructions=system_prompt,
+            text={
+                "format": {
+                    "type": "json_schema",
+                    "name": "classifier_response",
+                    "schema": CLASSIFIER_JSON_SCHEMA,
+                    "strict": False
+                }
+            },
+            input=[
+                {
+                    "role": "user",
+                    "content": user_content
+                }
+            ]
+        )
         return message.output_text
\ No newline at end of file
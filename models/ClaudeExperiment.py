@@ -1,5 +1,7 @@
+import json
 from anthropic import Anthropic
 from models.BaseExperiment import BaseExperiment
+from utilities.classifier_parsing import CLASSIFIER_JSON_SCHEMA
 
 class ClaudeExperiment(BaseExperiment):
     def _provider_name(self):
@@ -21,4 +23,31 @@ class ClaudeExperiment(BaseExperiment):
                 }
             ]
         )
-        return message.content[0].text.strip()
\ No newline at end of file
+        return message.content[0].text.strip()
+
+    def _call_classifier(self, model, system_prompt, user_content, temperature, max_tokens) -> str:
+        # Forced tool call so the annotation comes back as a schema-shaped object
+        message = self.client.messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system_prompt,
+            tools=[
+                {
+                    "name": "record_annotation",
+                    "description": "Record the annotation of the provided text",
+                    "input_schema": CLASSIFIER_JSON_SCHEMA
+                }
+            ],
+            tool_choice={"type": "tool", "name": "record_annotation"},
+            messages=[
+                {
+                    "role": "user",
+                    "content": user_content
+                }
+            ]
+        )
+        for block in message.content:
+            if block.type == "tool_use":
+                return json.dumps(block.input, ensure_ascii=False)
+        return "".join(block.text for block in message.content if block.type == "text").strip()
\ No newline at end of file
@@ -2,6 +2,8 @@ from openai import OpenAI
 from models.BaseExperiment import BaseExperiment
 
 class DeepSeekExperiment(BaseExperiment):
+    supports_batch = True
+
     def _provider_name(self):
         return "DeepSeek"
     
@@ -27,4 +29,44 @@ class DeepSeekExperiment(BaseExperiment):
                 }
             ]
         )
+        return message.choices[0].message.content
+
+    def _call_model_batch(self, model, system_prompt, user_content, temperature, max_tokens, n) -> list[str]:
+        # n choices from one request; any the API does not return are made up with single calls
+        message = self.client.chat.completions.create(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            n=n,
+            messages=[
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": user_content
+                }
+            ]
+        )
+        return [choice.message.content for choice in message.choices]
+
+    def _call_classifier(self, model, system_prompt, user_content, temperature, max_tokens) -> str:
+        # JSON mode; the schema itself is described in the classifier system prompt
+        message = self.client.chat.completions.create(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            response_format={"type": "json_object"},
+            messages=[
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": user_content
+                }
+            ]
+        )
         return message.choices[0].message.content
\ No newline at end of file
@@ -0,0 +1,122 @@
+import json
+import random
+import threading
+import time
+from typing import Optional
+from models.BaseExperiment import BaseExperiment
+
+REFUSAL_TEXT = "I'm sorry, but I can't help with that request."
+
+DEFAULT_CLASSIFICATION = {
+    "groups_mentioned": ["women", "middle-aged adults"],
+    "roles": {"women": "perpetrator", "middle-aged adults": "other"},
+    "sentiment": {"women": "negative", "middle-aged adults": "neutral"},
+    "notes": "canned classification",
+    "is_refusal": False
+}
+
+class FakeRateLimitError(Exception):
+    """Stand-in for a provider's HTTP 429 error"""
+    status_code = 429
+
+class FakeAPIError(Exception):
+    """Stand-in for a provider's HTTP 5xx error"""
+    status_code = 500
+
+class FakeExperiment(BaseExperiment):
+    """
+    Offline provider with seeded latency, error and refusal behaviour.
+    Used to benchmark and regression-test the orchestration without spending API credit.
+
+    Latency is lognormal around latency_median (seconds) with shape latency_sigma.
+    When classification is set the model acts as a classifier and answers with that JSON.
+    Every call is recorded in call_log as (call_number, start, end, user_content, ok) using time.perf_counter().
+    Generated stories embed their call number as 'fake story #N' so classifier calls can be matched to them.
+    """
+    def __init__(
+            self,
+            prompts: dict[str, dict[str, str]],
+            api_key: str,
+
+            target_model: str,
+            samples_per_prompt: int,
+            target_model_temperature: float,
+            target_model_max_tokens: int,
+            system_prompt: str,
+
+            latency_median: float = 0.05,
+            latency_sigma: float = 0.5,
+            error_rate: float = 0.0,
+            rate_limit_rate: float = 0.0,
+            refusal_rate: float = 0.0,
+            classification: Optional[dict] = None,
+            response_chars: int = 1500,
+            seed: int = 0,
+            **kwargs
+    ):
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.refusal_rate = refusal_rate
+        self.classification = classification
+        self.response_chars = response_chars
+        self.seed = seed
+
+        self.call_log: list[tuple[int, float, float, str, bool]] = []
+        self._call_count = 0
+        self._lock = threading.Lock()
+
+        super().__init__(
+            prompts=prompts,
+            api_key=api_key,
+            target_model=target_model,
+            samples_per_prompt=samples_per_prompt,
+            target_model_temperature=target_model_temperature,
+            target_model_max_tokens=target_model_max_tokens,
+            system_prompt=system_prompt,
+            **kwargs
+        )
+
+    def _provider_name(self):
+        return "Fake"
+
+    def _build_client(self):
+        return random.Random(self.seed)
+
+    def _draw(self) -> tuple[int, float, float]:
+        """Return (call number, latency, outcome roll) from the seeded generator"""
+        with self._lock:
+            self._call_count += 1
+            latency = self.client.lognormvariate(0.0, self.latency_sigma) * self.latency_median
+            return self._call_count, latency, self.client.random()
+
+    def _call_model(self, model, system_prompt, user_content, temperature, max_tokens) -> str:
+        call_number, latency, roll = self._draw()
+
+        start = time.perf_counter()
+        time.sleep(latency)
+
+        ok = False
+        try:
+            if roll < self.rate_limit_rate:
+                raise FakeRateLimitError(f"Error code: 429 - rate limited (call {call_number})")
+            if roll < self.rate_limit_rate + self.error_rate:
+                raise FakeAPIError(f"Error code: 500 - internal error (call {call_number})")
+
+            if self.classification is not None:
+                classification = self.classification
+                if REFUSAL_TEXT in user_content:
+                    classification = {"groups_mentioned": [], "roles": {}, "sentiment": {}, "notes": "", "is_refusal": True}
+                ok = True
+                return json.dumps(classification)
+
+            ok = True
+            if roll < self.rate_limit_rate + self.error_rate + self.refusal_rate:
+                return f"{REFUSAL_TEXT} (fake story #{call_number})"
+
+            header = f"Fake story #{call_number} from {model}. "
+            return header + "lorem ipsum " * max(0, (self.response_chars - len(header)) // 12)
+        finally:
+            with self._lock:
+                self.call_log.append((call_number, start, time.perf_counter(), user_content, ok))
@@ -1,8 +1,11 @@
 from google import genai
 from google.genai import types, Client
 from models.BaseExperiment import BaseExperiment
+from utilities.classifier_parsing import CLASSIFIER_JSON_SCHEMA
 
 class GeminiExperiment(BaseExperiment):
+    supports_batch = True
+
     def _provider_name(self):
         return "Gemini"
     
@@ -19,4 +22,35 @@ class GeminiExperiment(BaseExperiment):
             ),
             contents=user_content
         )
+        return message.text
+
+    def _call_model_batch(self, model, system_prompt, user_content, temperature, max_tokens, n) -> list[str]:
+        message = self.client.models.generate_content(
+            model=model,
+            config=types.GenerateContentConfig(
+                system_instruction=system_prompt,
+                max_output_tokens=max_tokens,
+                temperature=temperature,
+                candidate_count=n
+            ),
+            contents=user_content
+        )
+        return [
+            "".join(part.text or "" for part in (candidate.content.parts or []) if not getattr(part, "thought", False))
+            if candidate.content else ""
+            for candidate in message.candidates or []
+        ]
+
+    def _call_classifier(self, model, system_prompt, user_content, temperature, max_tokens) -> str:
+        message = self.client.models.generate_content(
+            model=model,
+            config=types.GenerateContentConfig(
+                system_instruction=system_prompt,
+                max_output_tokens=max_tokens,
+                temperature=temperature,
+                response_mime_type="application/json",
+                response_json_schema=CLASSIFIER_JSON_SCHEMA
+            ),
+            contents=user_content
+        )
         return message.text
\ No newline at end of file
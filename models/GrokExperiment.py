@@ -16,6 +16,19 @@ class GrokExperiment(BaseExperiment):
             temperature=temperature
         )
 
+        chat.append(system(system_prompt))
+        chat.append(user(user_content))
+        return chat.sample().content
+
+    def _call_classifier(self, model, system_prompt, user_content, temperature, max_tokens) -> str:
+        # JSON mode; the schema itself is described in the classifier system prompt
+        chat = self.client.chat.create(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            response_format="json_object"
+        )
+
         chat.append(system(system_prompt))
         chat.append(user(user_content))
         return chat.sample().content
\ No newline at end of file
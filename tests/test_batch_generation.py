@@ -0,0 +1,64 @@
+from models.FakeExperiment import FakeExperiment
+from utilities.CircuitBreaker import CircuitBreakerRegistry
+
+PROMPTS = {"crime": {"en": "Write a story."}}
+
+class BadRequest(Exception):
+    status_code = 400
+
+class BatchFake(FakeExperiment):
+    """Fake provider with a multi-completion request that fails or comes up short on demand"""
+    supports_batch = True
+
+    def __init__(self, batch_error=None, batch_returns=None, **kwargs):
+        self.batch_error = batch_error
+        self.batch_returns = batch_returns
+        self.batch_calls = 0
+        super().__init__(PROMPTS, "", "fake-target", 10, 1.0, 100, "", latency_median=0.001, **kwargs)
+
+    def _call_model_batch(self, model, system_prompt, user_content, temperature, max_tokens, n):
+        self.batch_calls += 1
+        if self.batch_error:
+            raise self.batch_error
+        returned = n if self.batch_returns is None else self.batch_returns
+        return [self._call_model(model, system_prompt, user_content, temperature, max_tokens) for _ in range(returned)]
+
+def test_providers_without_batching_use_parallel_single_calls():
+    fake = FakeExperiment(PROMPTS, "", "fake-target", 10, 1.0, 100, "", latency_median=0.001)
+    assert not fake.batch_generation
+    texts = fake.generate_responses("Write a story.", 0, 4)
+    assert len(texts) == 4 and all(texts)
+    assert len(fake.call_log) == 4
+
+def test_one_request_per_batch():
+    fake = BatchFake()
+    texts = fake.generate_responses("Write a story.", 0, 5)
+    assert len(texts) == 5 and all(texts)
+    assert fake.batch_calls == 1
+
+def test_short_batch_is_topped_up_with_single_calls():
+    fake = BatchFake(batch_returns=2)
+    texts = fake.generate_responses("Write a story.", 0, 5)
+    assert len(texts) == 5 and all(texts)
+    assert fake.batch_generation
+
+def test_rejected_n_turns_batching_off_and_retries_as_single_calls():
+    fake = BatchFake(batch_error=BadRequest("Error code: 400 - Invalid value for 'n': must be 1"))
+    texts = fake.generate_responses("Write a story.", 0, 3)
+    assert len(texts) == 3 and all(texts)
+    assert not fake.batch_generation
+
+    fake.generate_responses("Write a story.", 3, 3)
+    assert fake.batch_calls == 1
+
+def test_other_bad_requests_keep_batching_on():
+    fake = BatchFake(batch_error=BadRequest("Error code: 400 - The prompt was flagged by content filtering"))
+    texts = fake.generate_responses("Write a story.", 0, 3)
+    assert len(texts) == 3 and all(texts)
+    assert fake.batch_generation
+
+def test_rejected_n_does_not_count_against_the_circuit():
+    breakers = CircuitBreakerRegistry(failure_threshold=1)
+    fake = BatchFake(batch_error=BadRequest("Error code: 400 - n must be 1 for this model"), breakers=breakers)
+    fake.generate_responses("Write a story.", 0, 3)
+    assert fake.breaker.state == fake.breaker.CLOSED
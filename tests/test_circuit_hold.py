@@ -0,0 +1,112 @@
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from models.FakeExperiment import DEFAULT_CLASSIFICATION, FakeAPIError, FakeExperiment
+from utilities.CircuitBreaker import CircuitBreakerRegistry, CircuitOpenError
+
+# run_experiments lives next to every provider's SDK import
+utility_functions = pytest.importorskip("utilities.utility_functions")
+
+PROMPTS = {"crime": {"en": "Write a story."}}
+
+class OutageFake(FakeExperiment):
+    """Fake provider whose nth call (counting from 1) fails while down(n) is true"""
+    def __init__(self, target_model, samples_per_prompt, down, **kwargs):
+        self.down = down
+        self.calls = 0
+        super().__init__(PROMPTS, "", target_model, samples_per_prompt, 0.0, 100, "", latency_median=0.001, **kwargs)
+
+    def _call_model(self, model, system_prompt, user_content, temperature, max_tokens) -> str:
+        self.calls += 1
+        if self.down(self.calls):
+            raise FakeAPIError(f"Error code: 500 - outage (call {self.calls})")
+        return super()._call_model(model, system_prompt, user_content, temperature, max_tokens)
+
+def _run(target, classifier, tmp_path, **kwargs):
+    return utility_functions.run_experiments(
+        model=target,
+        classifiers=[classifier],
+        notifier=SimpleNamespace(notify_update=lambda **kwargs: None),
+        prefix="Fake",
+        log_dir="",
+        log_filename="",
+        output_dir=str(tmp_path),
+        output_filename="results.json",
+        **kwargs
+    )
+
+def _story(user_content: str) -> int:
+    return int(re.search(r"story #(\d+)", user_content).group(1))
+
+def test_classifier_outage_resumes_held_work_in_order(tmp_path):
+    breakers = CircuitBreakerRegistry(failure_threshold=1, cooldown=0.2)
+    target = OutageFake("fake-target", 8, down=lambda n: False, breakers=breakers)
+    classifier = OutageFake("fake-classifier", 1, down=lambda n: n == 1, classification=DEFAULT_CLASSIFICATION, breakers=breakers)
+
+    results = _run(target, classifier, tmp_path, rate_limit_delay=0.05)
+
+    # The first classification failed and opened the circuit; everything after it was held, then classified
+    assert classifier.breaker.times_opened == 1
+    assert [r.sample_index for r in results] == list(range(8))
+    assert all(r.groups_mentioned for r in results[1:])
+
+    classified = [(start, _story(content)) for _, start, _, content, ok in classifier.call_log if ok]
+    assert [story for _, story in classified] == list(range(2, 9))
+
+    generated = {number: start for number, start, _, _, _ in target.call_log}
+    assert any(start > generated[story + 1] for start, story in classified if story + 1 in generated)
+
+def test_target_outage_stops_and_saves_partial_results(tmp_path):
+    breakers = CircuitBreakerRegistry(failure_threshold=1, cooldown=0.05)
+    target = OutageFake("fake-target", 8, down=lambda n: n > 3, breakers=breakers)
+    classifier = OutageFake("fake-classifier", 1, down=lambda n: False, classification=DEFAULT_CLASSIFICATION, breakers=breakers)
+
+    results = _run(target, classifier, tmp_path, rate_limit_delay=0, max_hold=0.3)
+
+    # Sample 3 failed and opened the circuit, probes kept failing until max_hold ran out at sample 4
+    assert [r.sample_index for r in results] == [0, 1, 2, 3]
+    assert not results[3].raw_response
+    assert target.breaker.state == target.breaker.OPEN
+
+    with open(tmp_path / "results.json", encoding="utf-8") as f:
+        assert json.load(f)
+
+def test_shared_breaker_opens_only_after_failure_threshold():
+    breakers = CircuitBreakerRegistry(failure_threshold=3, cooldown=60.0)
+    target = OutageFake("fake", 1, down=lambda n: True, breakers=breakers)
+    classifier = OutageFake("fake", 1, down=lambda n: n != 2, classification=DEFAULT_CLASSIFICATION, breakers=breakers)
+    assert target.breaker is classifier.breaker
+    breaker = target.breaker
+
+    # Two failures, then a success resets the count
+    target.generate_response("Write a story.", 0)
+    classifier.classify_response("text")
+    assert breaker.consecutive_failures == 2
+    classifier.classify_response("text")
+    assert breaker.state == breaker.CLOSED and breaker.consecutive_failures == 0
+
+    # Failures from both sides count together
+    target.generate_response("Write a story.", 1)
+    classifier.classify_response("text")
+    assert breaker.state == breaker.CLOSED
+    target.generate_response("Write a story.", 2)
+    assert breaker.state == breaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        classifier.classify_response("text")
+
+def test_held_refusals_are_counted_once_classified(tmp_path):
+    breakers = CircuitBreakerRegistry(failure_threshold=1, cooldown=0.2)
+    target = OutageFake("fake-target", 8, down=lambda n: False, refusal_rate=1.0, breakers=breakers)
+    classifier = OutageFake("fake-classifier", 1, down=lambda n: n == 1, classification=DEFAULT_CLASSIFICATION, breakers=breakers)
+
+    _run(target, classifier, tmp_path, rate_limit_delay=0.05, progress_dir=str(tmp_path / "progress"))
+
+    with open(tmp_path / "progress" / "Fake.json", encoding="utf-8") as f:
+        progress = json.load(f)
+    # Every sample is a refusal; the first one's classification failed outright
+    assert progress["samples_classified"] == 8
+    assert progress["refusals"] == 7
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from utilities.classifier_parsing import extract_json_object, parse_classifier_output
+
+VALID = {
+    "groups_mentioned": ["Black", "women"],
+    "roles": {"Black": "victim", "women": "other"},
+    "sentiment": {"Black": "negative", "women": "neutral"},
+    "notes": "short note",
+    "is_refusal": False
+}
+
+def test_plain_object():
+    parsed = parse_classifier_output(json.dumps(VALID))
+    assert parsed.groups_mentioned == ["Black", "women"]
+    assert parsed.roles == {"Black": "victim", "women": "other"}
+    assert parsed.is_refusal is False
+
+def test_fenced_with_preamble_and_trailing_text():
+    text = f"Here is the annotation:\n```json\n{json.dumps(VALID, indent=2)}\n```\nLet me know if you need more."
+    assert parse_classifier_output(text).groups_mentioned == ["Black", "women"]
+
+def test_prose_braces_before_the_object_are_skipped():
+    text = f"Output {{as requested}}: {json.dumps(VALID)}"
+    assert parse_classifier_output(text).sentiment["Black"] == "negative"
+
+def test_braces_inside_strings_do_not_count():
+    reply = dict(VALID, notes="uses { and } in a note")
+    assert parse_classifier_output(f"Result: {json.dumps(reply)}").notes == "uses { and } in a note"
+
+def test_truncated_reply_is_an_error():
+    # Cut off at the token limit: the complete "roles" dict must not be taken for the answer
+    text = '{"groups_mentioned": ["Black"], "roles": {"Black": "victim"}, "sentiment": {"Black": "neg'
+    with pytest.raises(ValueError):
+        parse_classifier_output(text)
+
+def test_truncated_reply_after_preamble_is_an_error():
+    text = '```json\n{"groups_mentioned": ["Black"], "roles": {"Black": "victim"}, "notes": "cut'
+    with pytest.raises(ValueError):
+        extract_json_object(text)
+
+def test_empty_object_is_an_error():
+    # Claude's tool input when the tool call was truncated
+    with pytest.raises(ValueError):
+        parse_classifier_output("{}")
+
+@pytest.mark.parametrize("text", [
+    '["Black", "women"]',
+    '{"roles": {"Black": "victim"}, "is_refusal": false}',
+    '{"groups_mentioned": {"Black": "victim"}}',
+    '{"groups_mentioned": [], "is_refusal": "maybe"}',
+    "no json here"
+])
+def test_wrong_shape_is_an_error(text):
+    with pytest.raises(ValueError):
+        parse_classifier_output(text)
+
+@pytest.mark.parametrize("value, expected", [
+    ("true", True), ("yes", True), ("Yes", True), ("1", True),
+    ("false", False), ("no", False), ("0", False), ("", False)
+])
+def test_string_booleans(value, expected):
+    reply = dict(VALID, is_refusal=value)
+    assert parse_classifier_output(json.dumps(reply)).is_refusal is expected
+
+def test_missing_optional_fields_default():
+    parsed = parse_classifier_output('{"groups_mentioned": null}')
+    assert parsed.groups_mentioned == []
+    assert parsed.roles == {}
+    assert parsed.notes == ""
@@ -0,0 +1,118 @@
+import socketserver
+import threading
+import time
+
+from utilities.EmailNotifier import EmailNotifer, SMTPTransport
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough of SMTP for smtplib to deliver a message"""
+    def handle(self):
+        self.wfile.write(b"220 localhost ESMTP\r\n")
+        while line := self.rfile.readline():
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.wfile.write(b"250 localhost\r\n")
+            elif command == "DATA":
+                self.wfile.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                data = []
+                while (line := self.rfile.readline()) not in (b".\r\n", b""):
+                    data.append(line)
+                self.server.messages.append(b"".join(data).decode())
+                self.wfile.write(b"250 OK\r\n")
+            elif command == "QUIT":
+                self.wfile.write(b"221 Bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 OK\r\n")
+
+class RecordingTransport:
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, msg):
+        self.sent.append(msg)
+
+    def close(self):
+        pass
+
+def test_local_smtp_stand_in(tmp_path):
+    server = socketserver.ThreadingTCPServer(("localhost", 0), _SMTPHandler)
+    server.messages = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        transport = SMTPTransport(host="localhost", port=server.server_address[1], use_ssl=False, timeout=5.0)
+        notifier = EmailNotifer("me@example.com", "", transport=transport)
+        notifier.notify_started("Prefix", "model")
+        notifier.notify_update("Prefix", "model", "crime", "en")
+        notifier.close(timeout=10.0)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert len(server.messages) == 2
+    assert "Subject: [EXPERIMENT] Prefix started" in server.messages[0]
+    assert "starting scenario 'crime' for language 'en'" in server.messages[1]
+
+def test_processes_sharing_a_spool_send_one_digest(tmp_path):
+    spool = str(tmp_path / "email")
+    transports = [RecordingTransport() for _ in range(3)]
+    notifiers = [
+        EmailNotifer("me@example.com", "", transport=t, digest_interval=1.0, spool_dir=spool, spool_poll=0.05)
+        for t in transports
+    ]
+    for i, notifier in enumerate(notifiers):
+        notifier.notify_update(f"Model{i}", "model", "crime", "en")
+
+    time.sleep(1.5)
+    digests = [msg for t in transports for msg in t.sent]
+    assert len(digests) == 1
+    assert digests[0]["Subject"] == "[EXPERIMENT] Progress digest (3 updates)"
+
+    for notifier in notifiers:
+        notifier.close()
+    assert len([msg for t in transports for msg in t.sent]) == 1
+
+def test_closing_sends_what_is_spooled(tmp_path):
+    transport = RecordingTransport()
+    notifier = EmailNotifer("me@example.com", "", transport=transport, digest_interval=3600.0, spool_dir=str(tmp_path))
+    notifier.notify_update("Prefix", "model", "crime", "en")
+    notifier.close()
+    assert len(transport.sent) == 1
+
+def test_updates_spooled_while_a_digest_is_sent_are_kept(tmp_path):
+    spool = str(tmp_path / "email")
+    transports = [RecordingTransport() for _ in range(3)]
+    notifiers = [
+        EmailNotifer("me@example.com", "", transport=t, digest_interval=0.05, spool_dir=spool, spool_poll=0.01)
+        for t in transports
+    ]
+
+    def send_updates(i: int):
+        for j in range(100):
+            notifiers[i].notify_update(f"Model{i}-{j}", "model", "crime", "en")
+            time.sleep(0.002)
+    threads = [threading.Thread(target=send_updates, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for notifier in notifiers:
+        notifier.close()
+
+    bodies = "\n".join(msg.get_payload()[0].get_payload() for t in transports for msg in t.sent)
+    assert sorted(line.split()[2] for line in bodies.splitlines() if "Model" in line) == sorted(
+        f"Model{i}-{j}" for i in range(3) for j in range(100)
+    )
+
+def test_spool_file_still_being_written_is_left_for_the_next_digest(tmp_path):
+    # Another process's flush in progress: written under a temporary name and not yet renamed to .log
+    writing = tmp_path / "999_0.tmp"
+    writing.write_text("[2026-01-01 00:00:00] Other (model): starting scenario 'crime' for language 'en'\n", encoding="utf-8")
+
+    transport = RecordingTransport()
+    notifier = EmailNotifer("me@example.com", "", transport=transport, digest_interval=3600.0, spool_dir=str(tmp_path))
+    notifier.notify_update("Prefix", "model", "crime", "en")
+    notifier.close()
+
+    assert transport.sent[0]["Subject"] == "[EXPERIMENT] Progress digest (1 updates)"
+    assert writing.exists()
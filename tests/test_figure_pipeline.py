@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from utilities.figure_pipeline import CHARTS, chart_slice, load_clean_rows, range_series
+
+# Bar heights read off the committed report figures. The DeepSeek bars were drawn from an earlier cleaning of the
+# DeepSeek summaries and are left out
+LEADERSHIP_BY_PROVIDER = {
+    ("Anthropic", "female/women"): [0.04, 0.88, 0.587, 0.25, 0.525, 0.434],
+    ("Anthropic", "male/men"): [0.04, 1.0, 0.869, 0.25, 0.533, 0.46],
+    ("OpenAI", "female/women"): [0.04, 0.84, 0.64, 0.25, 0.589, 0.485],
+    ("OpenAI", "male/men"): [0.04, 1.0, 0.68, 0.25, 0.69, 0.498],
+    ("xAI", "female/women"): [0.04, 0.96, 0.613, 0.25, 0.525, 0.45],
+    ("xAI", "male/men"): [0.04, 1.0, 0.88, 0.25, 0.76, 0.549],
+}
+
+PERPETRATOR_GENDER = {
+    ("ClaudeHaiku4-5", "female/women"): [0.04, 0.56, 0.25, 0.438],
+    ("ClaudeHaiku4-5", "male/men"): [0.04, 1.0, 0.25, 0.656],
+    ("ClaudeSonnet4-6", "male/men"): [0.04, 1.0, 0.25, 0.58],
+    ("GPT4-1", "female/women"): [0.04, 0.6, 0.25, 0.5],
+    ("GPT4-1", "male/men"): [0.04, 1.0, 0.25, 0.594],
+    ("GPT5-2", "male/men"): [0.04, 1.0, 0.25, 0.917],
+    ("Grok3Mini", "male/men"): [0.04, 1.0, 0.25, 0.66],
+    ("Grok4-1_NonReasoning", "female/women"): [0.04, 0.44, 0.25, 0.562],
+    ("Grok4-1_NonReasoning", "male/men"): [0.04, 1.0, 0.25, 1.0],
+}
+
+@pytest.fixture(scope="module")
+def rows():
+    return load_clean_rows()
+
+def _bars(filename: str, rows: list[dict]) -> dict:
+    chart = next(c for c in CHARTS if c.filename == filename)
+    return {label: list(values.values()) for label, values in range_series(chart, chart_slice(chart, rows)).items()}
+
+@pytest.mark.parametrize("filename, expected", [
+    ("distribution of gender as hero of leadership by provider.png", LEADERSHIP_BY_PROVIDER),
+    ("Criminalization_Gender_Distrib.png", PERPETRATOR_GENDER),
+])
+def test_clean_source_reproduces_report_figure(rows, filename, expected):
+    bars = _bars(filename, rows)
+    for label, values in expected.items():
+        assert bars[label] == pytest.approx(values, abs=0.001), label
+
+def test_perpetrator_gender_has_no_unexpected_bars(rows):
+    bars = _bars("Criminalization_Gender_Distrib.png", rows)
+    assert {label for label in bars if not label[0].startswith("DeepSeek")} == set(PERPETRATOR_GENDER)
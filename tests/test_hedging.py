@@ -0,0 +1,88 @@
+import threading
+import time
+
+from utilities.HedgingPolicy import HedgingPolicy
+
+def _warm(policy: HedgingPolicy, key, seconds: float):
+    for _ in range(policy.min_samples):
+        policy.call(key, lambda: time.sleep(seconds) or "ok")
+
+def _concurrently(n: int, target):
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_waiting_for_a_worker_is_not_latency():
+    policy = HedgingPolicy(max_hedge_rate=1.0, min_delay=0.1, min_samples=5, concurrency=1)
+    _warm(policy, "key", 0.05)
+
+    # 8 callers share 2 workers, so most wait well past the 0.1s deadline before they run
+    _concurrently(8, lambda: policy.call("key", lambda: time.sleep(0.05) or "ok"))
+
+    assert policy.report()["key"]["hedges"] == 0
+    assert max(policy.tracker("key")._latencies) < 0.09
+
+def test_keys_do_not_share_workers():
+    policy = HedgingPolicy(max_hedge_rate=1.0, min_delay=0.01, min_samples=5, concurrency=1)
+    _warm(policy, "slow", 0.001)
+    _warm(policy, "fast", 0.001)
+
+    release = threading.Event()
+    stuck = [threading.Thread(target=lambda: policy.call("slow", lambda: release.wait() and "ok")) for _ in range(2)]
+    for thread in stuck:
+        thread.start()
+    time.sleep(0.05)
+
+    fast = threading.Thread(target=lambda: policy.call("fast", lambda: "ok"))
+    fast.start()
+    fast.join(timeout=0.5)
+    finished = not fast.is_alive()
+
+    release.set()
+    for thread in stuck + [fast]:
+        thread.join()
+    assert finished
+
+def test_slow_call_is_hedged():
+    policy = HedgingPolicy(max_hedge_rate=1.0, min_delay=0.0, min_samples=5, concurrency=1)
+    _warm(policy, "key", 0.01)
+
+    calls = []
+    def fn():
+        calls.append(None)
+        time.sleep(0.5 if len(calls) == 1 else 0.01)
+        return "ok"
+
+    assert policy.call("key", fn) == "ok"
+    assert policy.report()["key"]["hedge_wins"] == 1
+
+def test_primary_that_never_returns_does_not_hold_later_calls():
+    policy = HedgingPolicy(max_hedge_rate=1.0, min_delay=0.0, min_samples=5, concurrency=1)
+    _warm(policy, "key", 0.01)
+
+    never = threading.Event()
+    def stalls_first():
+        calls = []
+        def fn():
+            calls.append(None)
+            if len(calls) == 1:
+                never.wait()
+            return "ok"
+        return fn
+
+    # Each stalled primary keeps its worker, so both workers are held by losers after two calls
+    results = []
+    def run():
+        for fn in (stalls_first(), stalls_first(), lambda: "ok", lambda: "ok"):
+            results.append(policy.call("key", fn))
+    caller = threading.Thread(target=run, daemon=True)
+    caller.start()
+    caller.join(timeout=2.0)
+    finished = not caller.is_alive()
+
+    never.set()
+    assert finished
+    assert results == ["ok", "ok", "ok", "ok"]
+    assert policy.report()["key"]["hedge_wins"] == 2
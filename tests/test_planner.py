@@ -0,0 +1,76 @@
+import json
+import os
+
+from utilities.planner import load_history, plan_run
+
+def _write_output(path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    output = {
+        "samples_per_prompt": 1,
+        "scenarios": [{
+            "scenario": "crime",
+            "languages": [{
+                "language": "en",
+                "responses": [{
+                    "sample_index": 0,
+                    "raw_response": "A story.",
+                    "classifiers": [{"classifier": "c", "classifier_raw": "{\"groups_mentioned\": []}"}]
+                }]
+            }]
+        }]
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+
+def _tree(root: str) -> set[str]:
+    return {os.path.relpath(os.path.join(d, name), root) for d, _, names in os.walk(root) for name in names}
+
+def test_dry_run_does_not_write_into_outputs(tmp_path):
+    outputs = tmp_path / "outputs"
+    _write_output(str(outputs / "Provider" / "Prefix" / "Prefix_1.json"))
+    before = _tree(str(outputs))
+
+    for _ in range(3):
+        history = load_history(str(tmp_path / "logs"), str(outputs))
+
+    assert _tree(str(outputs)) == before
+    assert history.output_files == 1
+    assert history.response_chars[("Prefix", "en")] == [len("A story.")]
+
+def test_existing_sidecars_are_not_read_as_outputs(tmp_path):
+    outputs = tmp_path / "outputs"
+    path = str(outputs / "Provider" / "Prefix" / "Prefix_1.json")
+    _write_output(path)
+    with open(path + ".idx.json", "w", encoding="utf-8") as f:
+        json.dump({"version": 0}, f)
+    before = _tree(str(outputs))
+
+    history = load_history(str(tmp_path / "logs"), str(outputs))
+
+    assert _tree(str(outputs)) == before
+    assert history.output_files == 1
+
+def _plan(tmp_path, **kwargs):
+    return plan_run(
+        targets=[("model-a", "DeepSeek", "A"), ("model-b", "Claude", "B")],
+        classifiers=[("classifier", "Gemini")],
+        prompts={"crime": {"en": "Write a story.", "es": "Escribe una historia."}},
+        samples_per_prompt=5,
+        system_prompt="",
+        classifier_system="",
+        log_dir=str(tmp_path / "logs"),
+        output_dir=str(tmp_path / "outputs"),
+        **kwargs
+    )
+
+def test_generation_calls_without_batching(tmp_path):
+    plan = _plan(tmp_path)
+    assert plan["targets"]["A"]["generation_calls"] == 10
+    assert plan["targets"]["B"]["generation_calls"] == 10
+
+def test_native_batches_are_one_call_each(tmp_path):
+    plan = _plan(tmp_path, generation_batch_size=2, native_batch={"DeepSeek"})
+    # 5 samples per cell in batches of 2 -> 3 requests per cell
+    assert plan["targets"]["A"]["generation_calls"] == 6
+    assert plan["providers"]["DeepSeek"]["calls"] == 6
+    assert plan["targets"]["B"]["generation_calls"] == 10
@@ -0,0 +1,208 @@
+import os
+import re
+import json
+import zlib
+import hashlib
+import sqlite3
+import argparse
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+REF_PREFIX = "blob:sha256:"
+_REF = re.compile(r"^blob:sha256:([0-9a-f]{64})$")
+
+# save_results writes "blob_store" as the first key, so it is always near the start of the file
+_HEADER = re.compile(r'"blob_store":\s*"((?:[^"\\]|\\.)*)"')
+HEADER_BYTES = 4096
+
+class BlobStore:
+    """
+    Content-addressed store for long texts shared between output JSONs.
+
+    Each text is zlib-compressed and stored once, keyed by its sha256, in a single SQLite file (one small file
+    per text would waste most of a disk block each). Outputs refer to it as "blob:sha256:<hex>". SQLite's locking
+    lets the launcher's processes share one store. Reads are cached (LRU), since every classifier entry of a
+    sample points at the same response.
+    """
+    def __init__(self, path: str, cache_size: int = 4096):
+        self.path = path
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened on first use, so a loader that never resolves a digest never touches the file
+        if self._conn is None:
+            Path(os.path.dirname(self.path) or ".").mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=60.0, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, data BLOB NOT NULL)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def is_ref(value: Any) -> bool:
+        return isinstance(value, str) and value.startswith(REF_PREFIX) and _REF.match(value) is not None
+
+    def put(self, text: str, commit: bool = True) -> str:
+        """
+        Store text (once) and return its reference.
+        Texts no longer than a reference are returned unchanged, since storing them saves nothing
+        """
+        if len(text) <= len(REF_PREFIX) + 64:
+            return text
+
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("INSERT OR IGNORE INTO blobs (digest, data) VALUES (?, ?)", (digest, zlib.compress(data, 9)))
+            if commit:
+                conn.commit()
+        return REF_PREFIX + digest
+
+    def commit(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+
+    def get(self, ref: str) -> str:
+        """Text behind a reference. Raises KeyError if the blob is missing"""
+        digest = ref[len(REF_PREFIX):]
+        with self._lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                return self._cache[digest]
+
+            row = self._connection().execute("SELECT data FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            if row is None:
+                raise KeyError(f"Blob {digest} not found in {self.path}")
+            text = zlib.decompress(row[0]).decode("utf-8")
+
+            self._cache[digest] = text
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return text
+
+    def resolve(self, value: Any) -> Any:
+        """value with a reference replaced by its text; anything else is returned unchanged"""
+        return self.get(value) if self.is_ref(value) else value
+
+    def pack_output(self, output: dict, output_dir: str) -> dict:
+        """
+        Replace the long texts of a save_results output (responses, raw classifier outputs and
+        classifier system prompts) with references, and record where the store is relative to output_dir.
+        Modifies and returns output with "blob_store" as its first key
+        """
+        # One transaction for the whole output
+        for classifier in output.get("classifier_models", []):
+            if isinstance(classifier.get("system"), str):
+                classifier["system"] = self.put(classifier["system"], commit=False)
+        for response in _responses(output):
+            if isinstance(response.get("raw_response"), str):
+                response["raw_response"] = self.put(response["raw_response"], commit=False)
+            for entry in response.get("classifiers", []):
+                if isinstance(entry.get("classifier_raw"), str):
+                    entry["classifier_raw"] = self.put(entry["classifier_raw"], commit=False)
+        self.commit()
+
+        relative = os.path.relpath(self.path, output_dir).replace(os.sep, "/")
+        return {"blob_store": relative, **{k: v for k, v in output.items() if k != "blob_store"}}
+
+    def unpack_output(self, output: dict) -> dict:
+        """Inverse of pack_output. Modifies and returns output without the "blob_store" key"""
+        for classifier in output.get("classifier_models", []):
+            if "system" in classifier:
+                classifier["system"] = self.resolve(classifier["system"])
+        for response in _responses(output):
+            if "raw_response" in response:
+                response["raw_response"] = self.resolve(response["raw_response"])
+            for entry in response.get("classifiers", []):
+                if "classifier_raw" in entry:
+                    entry["classifier_raw"] = self.resolve(entry["classifier_raw"])
+        output.pop("blob_store", None)
+        return output
+
+    @classmethod
+    def for_output(cls, path: str, header: Optional[dict] = None) -> Optional["BlobStore"]:
+        """
+        Store an output JSON refers to, or None if its texts are stored inline
+
+        <INPUTS>
+        path: Path to the output JSON
+        header: Its already parsed top level keys, if available. Otherwise only the start of the file is read
+        """
+        if header is not None:
+            relative = header.get("blob_store")
+        else:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                m = _HEADER.search(f.read(HEADER_BYTES))
+            relative = json.loads(f'"{m.group(1)}"') if m else None
+        if not relative:
+            return None
+        return _open_store(os.path.normpath(os.path.join(os.path.dirname(path), relative)))
+
+# One instance per store file, so every loader in the process shares its cache
+_stores: dict[str, BlobStore] = {}
+
+def _open_store(path: str) -> BlobStore:
+    if path not in _stores:
+        _stores[path] = BlobStore(path)
+    return _stores[path]
+
+def _responses(output: dict):
+    for scenario in output.get("scenarios", []):
+        for language in scenario.get("languages", []):
+            yield from language.get("responses", [])
+
+def main():
+    parser = argparse.ArgumentParser(description="Move the texts of existing output JSONs into a blob store, or back")
+    parser.add_argument("command", choices=["pack", "unpack"])
+    parser.add_argument("files", nargs="+", help="Output JSON files, rewritten in place")
+    parser.add_argument("--store", default="outputs/blobs.sqlite", help="Blob store file for pack")
+    args = parser.parse_args()
+
+    store = BlobStore(args.store)
+    for path in args.files:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [BLOB] Skipping truncated {path}")
+            continue
+
+        existing = BlobStore.for_output(path, header=data)
+        if args.command == "pack":
+            if existing:
+                print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [BLOB] Already packed: {path}")
+                continue
+            before = os.path.getsize(path)
+            packed = store.pack_output(json.loads(json.dumps(data)), os.path.dirname(path))
+            # Only replace the original once it round-trips
+            if store.unpack_output(json.loads(json.dumps(packed))) != data:
+                print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [BLOB] Round trip mismatch, leaving {path} unchanged")
+                continue
+            data = packed
+        else:
+            if not existing:
+                print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [BLOB] Not packed: {path}")
+                continue
+            before = os.path.getsize(path)
+            data = existing.unpack_output(data)
+
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, path)
+        # The byte-offset index no longer matches the file
+        index_path = path + ".idx.json"
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [BLOB] {args.command}ed {path}: {before:,} -> {os.path.getsize(path):,} bytes")
+
+if __name__ == "__main__":
+    main()
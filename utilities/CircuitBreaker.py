@@ -0,0 +1,117 @@
+import threading
+import time
+from datetime import datetime
+from typing import Hashable
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+    def __init__(self, key: Hashable, retry_in: float):
+        super().__init__(f"Circuit open for {key}, next probe in {retry_in:.0f}s")
+        self.key = key
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one provider/model.
+
+    closed     calls go through; failure_threshold consecutive failures open the circuit
+    open       calls raise CircuitOpenError until the cooldown has passed
+    half_open  a single probe call is let through; success closes the circuit,
+               failure re-opens it with the cooldown doubled (up to max_cooldown)
+
+    Usage: acquire() before the call, then record_success() or record_failure()
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+            self,
+            key: Hashable,
+            failure_threshold: int = 5,
+            cooldown: float = 30.0,
+            max_cooldown: float = 600.0
+    ):
+        self.key = key
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.cooldown = cooldown
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def seconds_until_probe(self) -> float:
+        """Seconds until a half-open probe is allowed. 0 when calls can go through"""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def acquire(self):
+        """Raise CircuitOpenError if the call must be held, otherwise let it through"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                retry_in = self.opened_at + self.cooldown - now
+                if retry_in > 0:
+                    raise CircuitOpenError(self.key, retry_in)
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            # Half open: one probe at a time
+            if self._probe_in_flight:
+                raise CircuitOpenError(self.key, 0.0)
+            self._probe_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [CIRCUIT] {self.key} recovered, closing circuit")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.cooldown = self.base_cooldown
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN:
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                self._open()
+            elif self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self._probe_in_flight = False
+        print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [CIRCUIT] {self.key} open after {self.consecutive_failures} consecutive failures, probing in {self.cooldown:.0f}s")
+
+class CircuitBreakerRegistry:
+    """Shares one CircuitBreaker per provider/model key across every experiment that uses it"""
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0, max_cooldown: float = 600.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._breakers: dict[Hashable, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> CircuitBreaker:
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(
+                    key=key,
+                    failure_threshold=self.failure_threshold,
+                    cooldown=self.cooldown,
+                    max_cooldown=self.max_cooldown
+                )
+            return self._breakers[key]
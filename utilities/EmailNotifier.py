@@ -1,27 +1,152 @@
+import itertools
+import os
+import queue
 import smtplib
+import threading
+import time
 import traceback
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from utilities.Tracer import tracer
+
+# A digest lock older than this was left by a process that died while sending
+STALE_LOCK = 300.0
+
+# Numbers this process's spool files; every notifier in the process draws from it
+_spool_files = itertools.count()
+
+class SMTPTransport:
+    """
+    Sends messages over a single SMTP connection that is kept open between sends.
+    Reconnects once if the server dropped the connection since the last message.
+
+    Use use_ssl=False, no username and a local port to point it at a stand-in server,
+    e.g. `python -m aiosmtpd -n -l localhost:1025`
+    """
+    def __init__(
+            self,
+            host: str = 'smtp.gmail.com',
+            port: int = 465,
+            username: Optional[str] = None,
+            password: Optional[str] = None,
+            use_ssl: bool = True,
+            timeout: float = 30.0
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self._server: Optional[smtplib.SMTP] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        server = smtp_class(self.host, self.port, timeout=self.timeout)
+        if self.username:
+            server.login(self.username, self.password)
+        return server
+
+    def send_message(self, msg: MIMEMultipart):
+        """
+        Send a message, opening the connection on first use
+
+        <INPUTS>
+        msg: The fully built email message
+        """
+        if self._server is None:
+            self._server = self._connect()
+
+        try:
+            self._server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Idle connections get dropped by the server; retry once on a fresh one
+            self._server = self._connect()
+            self._server.send_message(msg)
+
+    def close(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            pass
+        self._server = None
 
 class EmailNotifer:
     """
     Handles email notifications on different events
+
+    Emails are queued and sent from a background thread so the experiment loop never waits on SMTP.
+    Started/completed/failed emails are sent as soon as the worker gets to them.
+    Progress updates are buffered and sent as one digest email every digest_interval seconds.
+
+    With spool_dir, processes sharing the directory (launcher.py's one process per model) send one digest
+    between them: every spool_poll seconds each process writes its new updates to a new spool file, and
+    whichever process takes the lock file once digest_interval has passed sends every spooled update.
+    On close a process sends whatever is spooled right away, so nothing is left behind by the last one.
     """
     def __init__(
             self,
             gmail_address: str,
             app_password: str,
-            to_address: str = None
+            to_address: str = None,
+            transport=None,
+            digest_interval: float = 600.0,
+            spool_dir: Optional[str] = None,
+            spool_poll: float = 30.0
     ):
         self.gmail_address = gmail_address
         self.app_password = app_password
         self.to_address = to_address or gmail_address # Default to myself
 
-    def _send(self, subject: str, body: str):
+        # Any object with send_message(msg) and close() can be used
+        self.transport = transport or SMTPTransport(username=gmail_address, password=app_password)
+        self.digest_interval = digest_interval
+
+        self._queue: queue.Queue = queue.Queue()
+        self._digest: list[str] = []
+        self._digest_lock = threading.Lock()
+        self._last_digest = time.monotonic()
+        self._closed = False
+
+        self.spool_dir = spool_dir
+        self._interval = min(digest_interval, spool_poll) if spool_dir else digest_interval
+        if spool_dir:
+            Path(spool_dir).mkdir(parents=True, exist_ok=True)
+            # The first shared digest goes out one interval after the first process started
+            sent_path = os.path.join(spool_dir, "digest.sent")
+            if not os.path.exists(sent_path):
+                Path(sent_path).touch()
+
+        self._worker = threading.Thread(target=self._run, name="EmailNotifier", daemon=True)
+        self._worker.start()
+
+    def _run(self):
+        """Worker loop. A None item on the queue means shut down"""
+        while True:
+            timeout = max(0.0, self._interval - (time.monotonic() - self._last_digest))
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush_digest()
+                continue
+
+            if item is None:
+                self._flush_digest(final=True)
+                self.transport.close()
+                return
+
+            self._deliver(*item)
+
+    def _deliver(self, subject: str, body: str):
         """
-        Send an email with the provided subject and body
-        
+        Send an email with the provided subject and body on the worker thread
+
         <INPUTS>
         subject: The email subject
         body: The body in the email
@@ -33,12 +158,122 @@ class EmailNotifer:
         msg.attach(MIMEText(body, 'plain'))
 
         try:
-            with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-                server.login(self.gmail_address, self.app_password)
-                server.send_message(msg)
+            with tracer.span("email_deliver", "email", subject=subject):
+                self.transport.send_message(msg)
             print(f"[EMAIL] Sent: {subject}")
         except Exception as e:
             print(f"[EMAIL] Failed to send '{subject}': {e}")
+            # Drop the connection so the next email starts clean
+            self.transport.close()
+
+    def _flush_digest(self, final: bool = False):
+        """
+        Send every buffered update as a single email, or with a spool, hand them to the shared digest
+
+        <INPUTS>
+        final: The notifier is closing, so spooled updates are sent without waiting for the interval
+        """
+        with self._digest_lock:
+            entries, self._digest = self._digest, []
+        self._last_digest = time.monotonic()
+
+        if self.spool_dir:
+            if entries:
+                # Written under a temporary name and renamed, so the sender never reads a file still being written
+                path = os.path.join(self.spool_dir, f"{os.getpid()}_{next(_spool_files)}")
+                with open(path + ".tmp", "w", encoding="utf-8") as f:
+                    f.write("".join(entry + "\n" for entry in entries))
+                os.replace(path + ".tmp", path + ".log")
+            entries = self._take_spooled(final)
+
+        if not entries:
+            return
+
+        self._deliver(
+            subject=f"[EXPERIMENT] Progress digest ({len(entries)} updates)",
+            body="\n".join(entries)
+        )
+
+    def _take_spooled(self, final: bool) -> list[str]:
+        """
+        Collect and remove the updates spooled by every process, if this process gets to send the digest
+
+        <INPUTS>
+        final: Ignore the interval and wait up to a minute for the lock
+
+        <OUTPUTS>
+        The updates in time order, or an empty list when another process sends them
+        """
+        lock_path = os.path.join(self.spool_dir, "digest.lock")
+        sent_path = os.path.join(self.spool_dir, "digest.sent")
+
+        deadline = time.monotonic() + (60.0 if final else 0.0)
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > STALE_LOCK:
+                        os.remove(lock_path)
+                        continue
+                except OSError:
+                    pass
+                if time.monotonic() >= deadline:
+                    return []
+                time.sleep(0.1)
+
+        try:
+            if not final and os.path.exists(sent_path) and time.time() - os.path.getmtime(sent_path) < self.digest_interval:
+                return []
+
+            entries = []
+            for name in os.listdir(self.spool_dir):
+                if not name.endswith(".log"):
+                    continue
+                path = os.path.join(self.spool_dir, name)
+                # .log files are complete and never written again
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        lines = [line.rstrip("\n") for line in f if line.strip()]
+                    os.remove(path)
+                except OSError:
+                    continue
+                entries.extend(lines)
+
+            if entries:
+                Path(sent_path).touch()
+            # Entries start with their timestamp
+            return sorted(entries)
+        finally:
+            os.remove(lock_path)
+
+    def _send(self, subject: str, body: str):
+        """
+        Queue an email with the provided subject and body
+
+        <INPUTS>
+        subject: The email subject
+        body: The body in the email
+        """
+        if self._closed:
+            print(f"[EMAIL] Notifier closed, dropping '{subject}'")
+            return
+        with tracer.span("email_send", "email", subject=subject):
+            self._queue.put((subject, body))
+
+    def close(self, timeout: float = 60.0):
+        """
+        Send any pending emails and digest, then stop the worker
+
+        <INPUTS>
+        timeout: Maximum seconds to wait for pending emails
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join(timeout=timeout)
 
     def notify_started(self, prefix: str, model: str):
         """
@@ -87,7 +322,7 @@ class EmailNotifer:
 
     def notify_update(self, prefix: str, model: str, scenario: str, lang: str):
         """
-        Structures an experiment update email
+        Adds an experiment update to the next digest email
 
         <INPUTS>
         prefix: The model prefix generating responses
@@ -95,10 +330,8 @@ class EmailNotifer:
         scenario: The scenario started
         lang: The language started
         """
-        self._send(
-            subject=f"[EXPERIMENT] {prefix} update",
-            body=(
-                f"Model: {model}\n"
-                f"Starting scenario '{scenario}' for language '{lang}' at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        with self._digest_lock:
+            self._digest.append(
+                f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {prefix} ({model}): "
+                f"starting scenario '{scenario}' for language '{lang}'"
             )
-        )
\ No newline at end of file
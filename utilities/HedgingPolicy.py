@@ -0,0 +1,179 @@
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, TimeoutError, wait, FIRST_COMPLETED
+from typing import Callable, Hashable, Optional
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one provider/model"""
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._latencies: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Latency at percentile q (0-100), or None until min_samples calls have been seen
+
+        <INPUTS>
+        q: Percentile to return
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+    def __len__(self) -> int:
+        return len(self._latencies)
+
+class HedgingPolicy:
+    """
+    Hedged requests for idempotent calls (temperature 0 classifier calls).
+
+    When a call has not returned after the provider's observed percentile latency, an identical
+    second request is sent and whichever succeeds first is used. Hedges are capped at max_hedge_rate
+    of all calls per provider/model. An in-flight HTTP request cannot be aborted through the sync SDKs,
+    so the losing request is left to finish on its own and its result is discarded.
+
+    One policy can be shared by all classifiers. Latencies and workers are per key, so a slow provider's
+    stuck losers never hold another provider's calls. Each key has room for concurrency calls plus one hedge
+    each, run on daemon threads. A call that finds no free worker is never queued behind stalled losers: a
+    primary runs inline without hedging, and a hedge is sent from the caller's own thread.
+    """
+    def __init__(
+            self,
+            percentile: float = 95.0,
+            max_hedge_rate: float = 0.1,
+            min_delay: float = 1.0,
+            min_samples: int = 20,
+            window: int = 200,
+            concurrency: int = 1
+    ):
+        self.percentile = percentile
+        self.max_hedge_rate = max_hedge_rate
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.concurrency = concurrency
+
+        self._workers: dict[Hashable, threading.BoundedSemaphore] = {}
+        self._trackers: dict[Hashable, LatencyTracker] = {}
+        self._calls: dict[Hashable, int] = defaultdict(int)
+        self._hedges: dict[Hashable, int] = defaultdict(int)
+        self._hedge_wins: dict[Hashable, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def tracker(self, key: Hashable) -> LatencyTracker:
+        with self._lock:
+            if key not in self._trackers:
+                self._trackers[key] = LatencyTracker(window=self.window, min_samples=self.min_samples)
+            return self._trackers[key]
+
+    def _start(self, key: Hashable, fn: Callable[[], str]) -> Optional[Future]:
+        """Run fn on a daemon thread if one of the key's workers is free, else return None"""
+        with self._lock:
+            if key not in self._workers:
+                self._workers[key] = threading.BoundedSemaphore(2 * self.concurrency)
+            workers = self._workers[key]
+        if not workers.acquire(blocking=False):
+            return None
+
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        def run():
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                workers.release()
+        threading.Thread(target=run, name="hedge", daemon=True).start()
+        return future
+
+    def _allow_hedge(self, key: Hashable) -> bool:
+        with self._lock:
+            if self._hedges[key] + 1 > self.max_hedge_rate * self._calls[key]:
+                return False
+            self._hedges[key] += 1
+            return True
+
+    def call(self, key: Hashable, fn: Callable[[], str]) -> str:
+        """
+        Run fn, sending a hedge request if it runs past the key's latency threshold
+
+        <INPUTS>
+        key: Provider/model the call goes to, e.g. ("Claude", "claude-sonnet-4-6")
+        fn: Zero-argument callable making the request
+        """
+        tracker = self.tracker(key)
+        threshold = tracker.percentile(self.percentile)
+        with self._lock:
+            self._calls[key] += 1
+
+        def timed() -> str:
+            start = time.monotonic()
+            result = fn()
+            tracker.record(time.monotonic() - start)
+            return result
+
+        # Not enough history yet, run inline
+        if threshold is None:
+            return timed()
+
+        primary = self._start(key, timed)
+        # Every worker is busy, possibly with losers that never return
+        if primary is None:
+            return timed()
+        try:
+            return primary.result(timeout=max(threshold, self.min_delay))
+        except TimeoutError:
+            pass
+
+        if not self._allow_hedge(key):
+            return primary.result()
+
+        hedge = self._start(key, timed)
+        if hedge is None:
+            # The primary may never return, so this thread sends the hedge itself
+            try:
+                result = timed()
+            except Exception:
+                if primary.done() and primary.exception() is None:
+                    return primary.result()
+                raise
+            if not primary.done():
+                with self._lock:
+                    self._hedge_wins[key] += 1
+            return result
+
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            self._hedge_wins[key] += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def report(self) -> dict:
+        """Per key: calls, hedges, hedge wins and current threshold in seconds"""
+        with self._lock:
+            keys = list(self._calls)
+        return {
+            key: {
+                "calls": self._calls[key],
+                "hedges": self._hedges[key],
+                "hedge_wins": self._hedge_wins[key],
+                "threshold": self.tracker(key).percentile(self.percentile)
+            }
+            for key in keys
+        }
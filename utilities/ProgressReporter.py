@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+# Seconds between writes when nothing changed, so readers can tell a long call from a dead process
+HEARTBEAT = 10.0
+
+class ProgressReporter:
+    """
+    Progress of one model run, published as a small JSON file that dashboard.py aggregates across processes.
+
+    The experiment loop only bumps counters under a lock. A background thread writes the file at most once
+    per interval, and only when something changed, so the loop never waits on disk. The file is written to a
+    temp file and renamed so readers never see half of it.
+
+    With progress_dir=None nothing is written and every method is a cheap no-op counter update.
+    """
+    def __init__(
+            self,
+            progress_dir: Optional[str],
+            prefix: str,
+            model: str,
+            total_samples: int,
+            interval: float = 1.0
+    ):
+        self.path = os.path.join(progress_dir, f"{prefix}.json") if progress_dir else None
+        self.interval = interval
+
+        self.state = {
+            "prefix": prefix,
+            "model": model,
+            "pid": os.getpid(),
+            "status": "running",
+            "started_at": time.time(),
+            "updated_at": time.time(),
+            "total_samples": total_samples,
+            "samples_done": 0,
+            "generation_errors": 0,
+            "samples_classified": 0,
+            "refusals": 0,
+            "classifier_calls": 0,
+            "classifier_errors": 0,
+            "classifier_in_flight": 0,
+            "held": 0,
+            "scenario": "",
+            "language": ""
+        }
+        self._lock = threading.Lock()
+        self._dirty = True
+        self._stop = threading.Event()
+        self._worker = None
+
+        if self.path:
+            Path(progress_dir).mkdir(parents=True, exist_ok=True)
+            self._worker = threading.Thread(target=self._run, name="ProgressReporter", daemon=True)
+            self._worker.start()
+
+    def _update(self, **changes):
+        with self._lock:
+            for key, value in changes.items():
+                self.state[key] = value
+            self._dirty = True
+
+    def _add(self, key: str, amount: int = 1):
+        with self._lock:
+            self.state[key] += amount
+            self._dirty = True
+
+    def cell_started(self, scenario: str, language: str):
+        self._update(scenario=scenario, language=language)
+
+    def sample_done(self, generation_failed: bool):
+        """
+        Count a finished sample
+
+        <INPUTS>
+        generation_failed: The target model returned no response
+        """
+        with self._lock:
+            self.state["samples_done"] += 1
+            self.state["generation_errors"] += generation_failed
+            self._dirty = True
+
+    def sample_classified(self, refusal: bool):
+        """
+        Count a sample once every classification of it is filled in, which for held or reused samples
+        can be well after sample_done(). Refusal rates are out of these samples
+
+        <INPUTS>
+        refusal: Any classifier flagged the response as a refusal
+        """
+        with self._lock:
+            self.state["samples_classified"] += 1
+            self.state["refusals"] += refusal
+            self._dirty = True
+
+    @contextmanager
+    def classifier_call(self):
+        """Count a classifier call in flight for the duration of the block"""
+        self._add("classifier_in_flight")
+        try:
+            yield
+        finally:
+            self._add("classifier_in_flight", -1)
+
+    def classifier_done(self, failed: bool):
+        with self._lock:
+            self.state["classifier_calls"] += 1
+            self.state["classifier_errors"] += failed
+            self._dirty = True
+
+    def set_held(self, held: int):
+        """Classifications waiting on a provider whose circuit is open"""
+        if held != self.state["held"]:
+            self._update(held=held)
+
+    def close(self, status: str = "finished"):
+        """Stop the writer and publish the final state, e.g. finished, failed or stopped"""
+        self._update(status=status)
+        if self._worker:
+            self._stop.set()
+            self._worker.join()
+            self._write()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._write()
+
+    def _write(self):
+        with self._lock:
+            if not self._dirty and time.time() - self.state["updated_at"] < HEARTBEAT:
+                return
+            self.state["updated_at"] = time.time()
+            snapshot = dict(self.state)
+            self._dirty = False
+
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            # The dashboard is best effort; the run must never fail on it
+            with self._lock:
+                self._dirty = True
@@ -0,0 +1,137 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# Returned by span() while tracing is off, so a disabled span is one attribute check
+_NO_SPAN = nullcontext()
+
+class _Span:
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record(self.name, self.category, self.start, end, self.args)
+        return False
+
+class Tracer:
+    """
+    Span tracer that writes Chrome trace event JSON, which chrome://tracing and ui.perfetto.dev open directly.
+
+    Spans are complete ("X") events keyed by process and thread, so work on the email worker
+    and hedging threads shows on its own track. Nothing is recorded until enable() is called.
+
+    Usage:
+        with tracer.span("classify", "classifier", model=name):
+            ...
+
+        @tracer.traced("save_results")
+        def save_results(...):
+    """
+    def __init__(self):
+        self.enabled = False
+        self._events: list[dict] = []
+        self._threads: dict[int, str] = {}
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Drop recorded spans and restart the clock, e.g. at the start of a run"""
+        with self._lock:
+            self._events = []
+            self._threads = {}
+            self._origin = time.perf_counter()
+
+    def span(self, name: str, category: str = "experiment", **args):
+        """
+        Context manager timing the enclosed block
+
+        <INPUTS>
+        name: Span name shown on the timeline
+        category: Chrome trace category, used to filter in the viewer
+        args: Extra key/values shown when the span is selected
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name, category, args)
+
+    def traced(self, name: Optional[str] = None, category: str = "experiment"):
+        """Decorator recording every call of the function as a span, named after it unless name is given"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Span(self, name or fn.__name__, category, {}):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _record(self, name: str, category: str, start: float, end: float, args: dict):
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": thread.ident,
+            "args": args
+        }
+        with self._lock:
+            self._events.append(event)
+            self._threads.setdefault(thread.ident, thread.name)
+
+    def write(self, path: str) -> Optional[str]:
+        """
+        Write the recorded spans as Chrome trace JSON. Does nothing while tracing is off
+
+        <INPUTS>
+        path: File to write, .trace.json appended if missing
+
+        <OUTPUTS>
+        Path written, or None
+        """
+        if not self.enabled:
+            return None
+        if not path.endswith(".json"):
+            path += ".trace.json"
+        Path(os.path.dirname(path) or ".").mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            pid = os.getpid()
+            metadata = [
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                for tid, name in self._threads.items()
+            ]
+            events = metadata + list(self._events)
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [TRACE] {len(events) - len(metadata)} spans written to {path}")
+        return path
+
+# Shared by every module in the process; main.py enables it with --trace
+tracer = Tracer()
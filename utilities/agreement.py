@@ -0,0 +1,238 @@
+"""
+Chance-corrected inter-classifier agreement (Fleiss' kappa and Krippendorff's alpha, nominal)
+for group mention, role and sentiment
+
+Annotations are encoded once as a sparse (sample x classifier x group) tensor in COO form with
+interned integer ids for every label. Each agreement question then becomes an item x category
+count matrix built with np.bincount, and both coefficients are closed-form reductions over it.
+
+  group mention  items = every (sample, group) pair for the groups seen in the cell,
+                 categories = mentioned / not mentioned, raters = classifiers that annotated the sample
+  role           items = (sample, group) pairs mentioned by >= 2 classifiers, categories = interned roles
+  sentiment      same as role, for sentiment
+
+An annotation with no groups, no notes and no refusal flag is a failed call or unparseable output.
+It counts as missing, not as "mentioned nothing".
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from utilities.data_structures import AnnotatedResponse
+
+class LabelInterner:
+    """Maps labels to dense integer ids in first-seen order"""
+    def __init__(self):
+        self.ids: dict = {}
+        self.labels: list = []
+
+    def __call__(self, label) -> int:
+        i = self.ids.get(label)
+        if i is None:
+            i = self.ids[label] = len(self.labels)
+            self.labels.append(label)
+        return i
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+@dataclass
+class AnnotationTensor:
+    """Sparse (sample x classifier x group) annotation tensor with interned ids"""
+    cells: LabelInterner = field(default_factory=LabelInterner)       # (scenario, language)
+    samples: LabelInterner = field(default_factory=LabelInterner)     # (scenario, language, sample_index)
+    classifiers: LabelInterner = field(default_factory=LabelInterner)
+    groups: LabelInterner = field(default_factory=LabelInterner)
+    roles: LabelInterner = field(default_factory=LabelInterner)
+    sentiments: LabelInterner = field(default_factory=LabelInterner)
+
+    sample_cell: np.ndarray = None  # cell id per sample id
+
+    # One entry per (sample, classifier) that produced a usable annotation
+    rated_sample: np.ndarray = None
+    rated_classifier: np.ndarray = None
+
+    # COO entries, one per (sample, classifier, group) mention
+    sample: np.ndarray = None
+    classifier: np.ndarray = None
+    group: np.ndarray = None
+    role: np.ndarray = None
+    sentiment: np.ndarray = None
+
+def _is_missing(r: AnnotatedResponse) -> bool:
+    return not r.groups_mentioned and not r.notes and not r.is_refusal
+
+def build_tensor(results: list[AnnotatedResponse]) -> AnnotationTensor:
+    """
+    Encode annotated results as an AnnotationTensor
+
+    <INPUTS>
+    results: Annotated results from run_experiments() or load_results()
+    """
+    t = AnnotationTensor()
+    sample_cell: list[int] = []
+    rated: dict[tuple[int, int], None] = {}
+    entries: dict[tuple[int, int, int], tuple[int, int]] = {}
+
+    for r in results:
+        if not r.raw_response or _is_missing(r):
+            continue
+
+        cell_id = t.cells((r.scenario, r.language))
+        sample_id = t.samples((r.scenario, r.language, r.sample_index))
+        if sample_id == len(sample_cell):
+            sample_cell.append(cell_id)
+        classifier_id = t.classifiers(r.classifier)
+        rated[(sample_id, classifier_id)] = None
+
+        for group in r.groups_mentioned:
+            # De-duplicated per (sample, classifier, group), first label wins
+            key = (sample_id, classifier_id, t.groups(group))
+            if key not in entries:
+                entries[key] = (t.roles(r.roles.get(group, "unspecified")), t.sentiments(r.sentiment.get(group, "neutral")))
+
+    t.sample_cell = np.array(sample_cell, dtype=np.int64)
+
+    rated_pairs = np.array(list(rated), dtype=np.int64).reshape(-1, 2)
+    t.rated_sample, t.rated_classifier = rated_pairs[:, 0], rated_pairs[:, 1]
+
+    keys = np.array(list(entries), dtype=np.int64).reshape(-1, 3)
+    labels = np.array(list(entries.values()), dtype=np.int64).reshape(-1, 2)
+    t.sample, t.classifier, t.group = keys[:, 0], keys[:, 1], keys[:, 2]
+    t.role, t.sentiment = labels[:, 0], labels[:, 1]
+    return t
+
+def fleiss_kappa(counts: np.ndarray) -> Optional[float]:
+    """
+    Fleiss' kappa from an item x category count matrix. Items may have different rater counts;
+    items with fewer than 2 ratings are dropped.
+    """
+    raters = counts.sum(axis=1)
+    counts, raters = counts[raters >= 2], raters[raters >= 2]
+    if not len(counts):
+        return None
+
+    p_item = ((counts ** 2).sum(axis=1) - raters) / (raters * (raters - 1))
+    p_bar = p_item.mean()
+    p_category = counts.sum(axis=0) / raters.sum()
+    p_expected = (p_category ** 2).sum()
+    if p_expected >= 1:
+        return None
+    return float((p_bar - p_expected) / (1 - p_expected))
+
+def krippendorff_alpha(counts: np.ndarray) -> Optional[float]:
+    """Krippendorff's alpha (nominal) from an item x category count matrix"""
+    raters = counts.sum(axis=1)
+    counts, raters = counts[raters >= 2], raters[raters >= 2]
+    if not len(counts):
+        return None
+
+    n_category = counts.sum(axis=0)
+    n = n_category.sum()
+    observed = ((raters ** 2 - (counts ** 2).sum(axis=1)) / (raters - 1)).sum() / n
+    expected = (n ** 2 - (n_category ** 2).sum()) / (n * (n - 1))
+    if expected == 0:
+        return None
+    return float(1 - observed / expected)
+
+def _mention_counts(t: AnnotationTensor, sample_mask: np.ndarray) -> np.ndarray:
+    """
+    (items x 2) mentioned/not-mentioned counts over every (sample, group) pair of the selected
+    samples, where the groups are those mentioned anywhere in each sample's cell
+    """
+    samples = np.flatnonzero(sample_mask)
+    if not len(samples):
+        return np.zeros((0, 2))
+
+    raters = np.bincount(t.rated_sample, minlength=len(t.samples))
+
+    entry_mask = sample_mask[t.sample]
+    cells = t.sample_cell[t.sample[entry_mask]]
+    groups = t.group[entry_mask]
+
+    # Group vocabulary per cell: unique (cell, group) pairs
+    cell_groups = np.unique(cells * len(t.groups) + groups)
+    vocab_cell, vocab_group = cell_groups // max(len(t.groups), 1), cell_groups % max(len(t.groups), 1)
+
+    # Items: cross product of each sample with its cell's vocabulary
+    order = np.argsort(vocab_cell, kind="stable")
+    vocab_cell, vocab_group = vocab_cell[order], vocab_group[order]
+    starts = np.searchsorted(vocab_cell, t.sample_cell[samples], side="left")
+    stops = np.searchsorted(vocab_cell, t.sample_cell[samples], side="right")
+    sizes = stops - starts
+    item_sample = np.repeat(samples, sizes)
+    offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    item_group = vocab_group[np.repeat(starts, sizes) + offsets]
+
+    # Mentions per item via a sorted key lookup
+    item_keys = item_sample * len(t.groups) + item_group
+    mention_keys, mention_counts = np.unique(t.sample[entry_mask] * len(t.groups) + groups, return_counts=True)
+    positions = np.searchsorted(mention_keys, item_keys)
+    found = (positions < len(mention_keys)) & (mention_keys[np.minimum(positions, len(mention_keys) - 1)] == item_keys)
+    mentioned = np.where(found, mention_counts[np.minimum(positions, len(mention_keys) - 1)], 0)
+
+    return np.stack([mentioned, raters[item_sample] - mentioned], axis=1).astype(np.float64)
+
+def _label_counts(t: AnnotationTensor, labels: np.ndarray, n_labels: int, sample_mask: np.ndarray) -> np.ndarray:
+    """(items x labels) counts for (sample, group) items, over the selected samples"""
+    entry_mask = sample_mask[t.sample]
+    if not entry_mask.any():
+        return np.zeros((0, max(n_labels, 1)))
+
+    item_keys = t.sample[entry_mask] * len(t.groups) + t.group[entry_mask]
+    _, item_ids = np.unique(item_keys, return_inverse=True)
+    n_items = int(item_ids.max()) + 1
+    counts = np.bincount(item_ids * n_labels + labels[entry_mask], minlength=n_items * n_labels)
+    return counts.reshape(n_items, n_labels).astype(np.float64)
+
+def _coefficients(counts: np.ndarray) -> dict:
+    return {
+        "fleiss_kappa": fleiss_kappa(counts),
+        "krippendorff_alpha": krippendorff_alpha(counts),
+        "items": int((counts.sum(axis=1) >= 2).sum())
+    }
+
+def _agreement(t: AnnotationTensor, sample_mask: np.ndarray) -> dict:
+    return {
+        "group_mention": _coefficients(_mention_counts(t, sample_mask)),
+        "role": _coefficients(_label_counts(t, t.role, len(t.roles), sample_mask)),
+        "sentiment": _coefficients(_label_counts(t, t.sentiment, len(t.sentiments), sample_mask))
+    }
+
+def compute_agreement(results: list[AnnotatedResponse]) -> dict:
+    """
+    Chance-corrected agreement per (scenario, language) cell and over all cells
+
+    <OUTPUTS>
+    {
+      "cells": {scenario: {language: {group_mention, role, sentiment}}},
+      "global": {group_mention, role, sentiment}
+    }
+    where each metric is {fleiss_kappa, krippendorff_alpha, items}
+    """
+    t = build_tensor(results)
+    output = {"cells": {}, "global": _agreement(t, np.ones(len(t.samples), dtype=bool))}
+
+    for cell_id, (scenario, language) in enumerate(t.cells.labels):
+        output["cells"].setdefault(scenario, {})[language] = _agreement(t, t.sample_cell == cell_id)
+    return output
+
+def annotate_stats_with_agreement(stats: dict, results: list[AnnotatedResponse]) -> dict:
+    """
+    Add an "agreement" entry to each cell of the output of compute_statistics() in place
+
+    <INPUTS>
+    stats: Output of compute_statistics()
+    results: The results the statistics were computed from
+
+    <OUTPUTS>
+    The global agreement over all cells
+    """
+    agreement = compute_agreement(results)
+    for scenario, lang_data in agreement["cells"].items():
+        for language, cell in lang_data.items():
+            if language in stats.get(scenario, {}):
+                stats[scenario][language]["agreement"] = cell
+    return agreement["global"]
@@ -0,0 +1,130 @@
+"""
+Parsing and validation of classifier output into ClassifierResponse
+"""
+
+import json
+from utilities.data_structures import ClassifierResponse
+
+# JSON schema handed to providers that support structured output / tool calling
+CLASSIFIER_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "groups_mentioned": {"type": "array", "items": {"type": "string"}},
+        "roles": {"type": "object", "additionalProperties": {"type": "string"}},
+        "sentiment": {"type": "object", "additionalProperties": {"type": "string"}},
+        "notes": {"type": "string"},
+        "is_refusal": {"type": "boolean"}
+    },
+    "required": ["groups_mentioned", "roles", "sentiment", "notes", "is_refusal"]
+}
+
+# Accepted spellings for is_refusal when a model returns it as a string
+_TRUE_STRINGS = {"true", "yes", "y", "1"}
+_FALSE_STRINGS = {"false", "no", "n", "0", ""}
+
+def _closing_brace(text: str, start: int) -> int:
+    """
+    Index of the brace that closes the object opened at text[start], or -1 if the text ends first.
+    Braces inside JSON strings are skipped.
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+def extract_json_object(text: str) -> dict:
+    """
+    Return the first complete top-level JSON object in text.
+    Tolerates markdown fences, a preamble and trailing text. Objects nested inside another one are never
+    returned on their own, so a reply truncated mid-object is an error rather than its first complete inner dict.
+
+    <INPUTS>
+    text: Raw classifier output
+    """
+    text = text.strip()
+
+    # Fast path: the whole response is the object
+    if text.startswith("{"):
+        try:
+            parsed = json.loads(text)
+            if isinstance(parsed, dict):
+                return parsed
+        except ValueError:
+            pass
+
+    start = text.find("{")
+    while start != -1:
+        end = _closing_brace(text, start)
+        if end == -1:
+            raise ValueError(f"Truncated JSON object in classifier output ({len(text)} chars)")
+        try:
+            parsed = json.loads(text[start:end + 1])
+            if isinstance(parsed, dict):
+                return parsed
+        except ValueError:
+            pass
+        # Skip the whole balanced span, so nothing nested inside it is picked up
+        start = text.find("{", end + 1)
+
+    raise ValueError(f"No complete JSON object in classifier output ({len(text)} chars)")
+
+def _as_str_dict(value) -> dict[str, str]:
+    if not isinstance(value, dict):
+        return {}
+    return {str(k): str(v) for k, v in value.items() if v is not None}
+
+def to_classifier_response(parsed: dict) -> ClassifierResponse:
+    """
+    Validate a parsed classifier object into a ClassifierResponse, coercing loose types
+
+    <INPUTS>
+    parsed: Dict decoded from the classifier output
+    """
+    if not isinstance(parsed, dict):
+        raise ValueError(f"Expected a JSON object, got {type(parsed).__name__}")
+
+    # An empty or wrong-shaped object (e.g. a truncated tool call) is a parse failure, not "no groups"
+    if "groups_mentioned" not in parsed:
+        raise ValueError(f"Missing groups_mentioned (keys: {sorted(parsed.keys())})")
+
+    groups = parsed["groups_mentioned"] or []
+    if isinstance(groups, str):
+        groups = [groups]
+    if not isinstance(groups, list):
+        raise ValueError(f"groups_mentioned must be a list, got {type(groups).__name__}")
+
+    is_refusal = parsed.get("is_refusal", False)
+    if isinstance(is_refusal, str):
+        value = is_refusal.strip().lower()
+        if value not in _TRUE_STRINGS | _FALSE_STRINGS:
+            raise ValueError(f"is_refusal must be a boolean, got {is_refusal!r}")
+        is_refusal = value in _TRUE_STRINGS
+
+    return ClassifierResponse(
+        groups_mentioned=[str(g) for g in groups if g is not None],
+        roles=_as_str_dict(parsed.get("roles")),
+        sentiment=_as_str_dict(parsed.get("sentiment")),
+        notes=str(parsed.get("notes") or ""),
+        is_refusal=bool(is_refusal)
+    )
+
+def parse_classifier_output(text: str) -> ClassifierResponse:
+    """Extract and validate a ClassifierResponse from raw classifier output"""
+    return to_classifier_response(extract_json_object(text))
@@ -1,4 +1,5 @@
 from dataclasses import dataclass, field
+from typing import Optional
 
 @dataclass
 class ClassifierResponse:
@@ -15,4 +16,6 @@ class AnnotatedResponse(ClassifierResponse):
   language: str = ""
   sample_index: int = 0
   raw_response: str = ""
-  classifier_raw: str = ""
\ No newline at end of file
+  classifier_raw: str = ""
+  # Sample index of the near-duplicate whose classification was reused, None when classified directly
+  reused_from: Optional[int] = None
\ No newline at end of file
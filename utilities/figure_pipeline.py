@@ -0,0 +1,566 @@
+"""
+Figure pipeline for the report: renders the charts in CHARTS into figures/ (pass --images report/src/images
+to replace the report's figures)
+
+Rows come from one of two sources, one row per (model, scenario, language, group, role):
+  clean    the cleaned summaries in csv_summaries/clean/ the report's figures were made from. Group labels there
+           were merged by hand (e.g. women/Woman/female -> female/women) and roles cleaned, and each row is the
+           min and max over the raw summary rows it merges (the pivot sheet of each workbook)
+  outputs  the newest run of each model: the output JSON under outputs/<provider>/<prefix>/ when it is complete
+           (read through the byte-offset index and summarized with compute_statistics()), otherwise the summary
+           printed at the end of the run's log under logs/. Labels are raw, so min and max are the same value
+
+Following the report, rows whose role is only other or bystander are dropped, as are rows whose max mention rate
+is below min_mention_rate. From the clean source this gives the committed perpetrator gender and leadership by
+provider figures bar for bar, except the DeepSeek bars. The committed figures were drawn by hand from the
+summaries while they were still being cleaned, and the other figures (and DeepSeek everywhere) differ from what
+the committed summaries give. That is why the default output is figures/ and not the report's images.
+
+A chart selects a slice of those rows (scenarios, role, label categories) and its rendered PNG is reused
+while the sha256 of its spec and slice matches the manifest in the images directory. Stale charts are rendered
+in a process pool.
+
+Chart kinds, following the hand-made figures:
+  range  grouped bars per (x, category): min of the min, max of the max and average of the max mention rate
+         and classifier agreement over the matching rows
+  share  100% stacked bars per x: number of distinct group labels in each category
+  top    highest max mention rate per group label (categories only filter)
+
+Usage: python -m utilities.figure_pipeline [--source clean|outputs] [--clean csv_summaries/clean] [--outputs outputs] [--logs logs] [--images figures] [--only NAME ...] [--force] [--workers N]
+"""
+
+import os
+import re
+import csv
+import json
+import hashlib
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Optional
+
+from utilities.data_structures import AnnotatedResponse
+from utilities.output_index import OutputIndex
+from utilities.parse_summary import parse_summary
+
+# Bump to re-render every chart after changing how they are drawn
+RENDER_VERSION = 2
+MANIFEST_NAME = ".figure_manifest.json"
+IMAGES_DIR = "figures"
+REPORT_IMAGES_DIR = os.path.join("report", "src", "images")
+CLEAN_DIR = os.path.join("csv_summaries", "clean")
+
+PROVIDER_NAMES = {
+    "Claude": "Anthropic",
+    "ChatGPT": "OpenAI",
+    "DeepSeek": "DeepSeek",
+    "Gemini": "Google",
+    "Grok": "xAI"
+}
+
+# Clean summaries are named after the model prefix, not the provider directory
+CLEAN_PROVIDERS = (
+    ("Claude", "Anthropic"),
+    ("GPT", "OpenAI"),
+    ("DeepSeek", "DeepSeek"),
+    ("Gemini", "Google"),
+    ("Grok", "xAI")
+)
+
+# Pivot columns of the clean summaries
+CLEAN_COLUMNS = (
+    "Scenario", "Language", "merged group", "top role CLEAN",
+    "Min of Mention Rate", "Max of Mention Rate", "Min of Classifier Agreement", "Max of Classifier Agreement"
+)
+
+# Roles the report leaves out as ambiguous
+IGNORED_ROLES = {"other", "bystander"}
+
+# Label categories, first match wins. Patterns are matched against the lowercased group label
+GENDER = (
+    ("female/women", r"\b(female|women|woman|girls?|feminine)\b"),
+    ("male/men", r"\b(male|men|man|boys?|masculine)\b"),
+)
+
+LABELS = (
+    ("socioeconomic status", r"socio-?economic"),
+    ("legal status", r"undocumented|refugee|asylum|migrant|immigrant|stateless|legal status|illegal|deport"),
+    ("race/ethnicity", r"\b(black|white|latin[oax]s?|hispanic|asian|arab|indigenous|caucasian|african[- ]american|ethnic|racial|race|of color)\b"),
+    ("religion", r"muslim|christian|jewish|hindu|buddhist|catholic|sikh|islam|religio"),
+    ("nationality", r"\b(syrian|afghan|mexican|honduran|venezuelan|guatemalan|salvadoran|sudanese|iraqi|ukrainian|chinese|american|nigerian|eritrean|somali|haitian|cuban|colombian|palestinian|yemeni|rohingya|egyptian|moroccan|spanish|saudi|nationals?|citizens?|foreigners?|nationality)\b"),
+    ("age", r"\b(\d+|age[ds]?|elderly|older|young|youth|teen(ager)?s?|middle-aged|adults?|seniors?|children|child|minors?)\b"),
+    ("gender", r"\b(female|male|women|men|woman|man|girls?|boys?|non-?binary|transgender)\b"),
+    ("familial role", r"mothers?|fathers?|parents?|sons?\b|daughters?|wi(fe|ves)|husbands?|siblings?|widow|family|families"),
+    ("economic status", r"poor|low-income|poverty|unemployed|working[- ]class|homeless|wealthy|\brich\b|economic|income"),
+    ("education", r"educat|dropouts?|graduates?|students?|school"),
+    ("health status", r"disab|mental|\bill\b|illness|health|trauma|ptsd|patients?|addict"),
+    ("criminal role", r"criminal|convict|offenders?|smugglers?|traffickers?|gangs?|prisoners?|inmates?|cartel"),
+    ("institutional role", r"police|officers?|officials?|government|authorit|border|judges?|lawyers?|soldiers?|military"),
+    ("social role", r"community|neighbou?rs?|workers?|volunteers?|activists?|employees?|employers?|teachers?|society"),
+)
+
+CATEGORY_SETS = {"gender": GENDER, "labels": LABELS}
+
+# Category sets whose labels the clean summaries already merged to: a merged label counts only when it is the
+# category itself, e.g. "young men" was merged as an age label on purpose and is not male/men
+MERGED_EXACT = {"gender"}
+
+def only(*labels: str) -> tuple[str, ...]:
+    """Exclude list keeping just these label categories"""
+    return tuple(label for label, _ in LABELS if label not in labels)
+
+CRIMINALIZATION = ("financial_fraud", "terrorism", "state_violence", "protest_civil_unrest", "drug_use_addiction")
+
+@dataclass(frozen=True)
+class Chart:
+    """One figure in the report"""
+    filename: str
+    title: str
+    kind: str                       # range | share | top
+    scenarios: tuple[str, ...]
+    x: str = "model"                # model | provider | language
+    role: Optional[str] = None      # only rows whose role is this (or includes it, e.g. expert|hero)
+    categories: Optional[str] = None  # key of CATEGORY_SETS, None keeps raw group labels
+    exclude: tuple[str, ...] = ()   # categories left out
+    averages: bool = False          # range charts: also plot the averages
+    top_n: int = 10                 # top charts: number of bars
+    min_mention_rate: float = 0.2
+
+CHARTS: list[Chart] = [
+    Chart("Criminalization_Gender_Distrib.png", "Distribution of Perpetrator Gender Mention Rates in Criminalization Scenarios",
+          "range", CRIMINALIZATION, role="perpetrator", categories="gender"),
+    Chart("Criminalization_Gender_Distrib_Victim.png", "Distribution of Victim Gender Mention Rates in Criminalization Scenarios",
+          "range", CRIMINALIZATION, role="victim", categories="gender"),
+    Chart("criminal rehabilitation perp.png", "Criminal Rehabilitation Perpetrators Across Models and Languages",
+          "top", ("criminal_rehabilitation",), role="perpetrator", top_n=7),
+    Chart("criminal rehabilitation language victims.png", "Distribution of Victims of Criminal Rehabilitation Across Languages",
+          "range", ("criminal_rehabilitation",), x="language", role="victim", categories="labels"),
+    Chart("criminal rehabilitation provider victims.png", "Distribution of Victims of Criminal Rehabilitation Across Providers",
+          "range", ("criminal_rehabilitation",), x="provider", role="victim", categories="labels"),
+    Chart("criminal rehabilitation provider victim label distrib.png", "Distribution of Criminal Rehabilitation Victim Labels Across Providers",
+          "share", ("criminal_rehabilitation",), x="provider", role="victim", categories="labels"),
+    Chart("distribution of nationilities in immigration asylum.png", "Distribution of Nationalities in Immigration Asylum",
+          "top", ("immigration_asylum",), categories="labels", exclude=only("nationality"), top_n=10),
+    Chart("distribution of victim labels in immigration asylum by provider.png", "Distribution of Victim Labels in Immigration Asylum by Provider",
+          "share", ("immigration_asylum",), x="provider", role="victim", categories="labels"),
+    Chart("distribution of victim labels in immigration asylum by provider without legal status.png", "Distribution of Victim Labels in Immigration Asylum by Provider (without Legal Status)",
+          "share", ("immigration_asylum",), x="provider", role="victim", categories="labels", exclude=("legal status",)),
+    Chart("distribution of victim labels in immigration asylum by language.png", "Distribution of Victim Labels in Immigration Asylum by Language",
+          "share", ("immigration_asylum",), x="language", role="victim", categories="labels"),
+    Chart("distribution of victim labels in immigration asylum by language without legal status.png", "Distribution of Victim Labels in Immigration Asylum by Language (without Legal Status)",
+          "share", ("immigration_asylum",), x="language", role="victim", categories="labels", exclude=("legal status",)),
+    Chart("distribution of race ethnicity in disability by language.png", "Distribution of Race/Ethnicity in Disability by Language",
+          "range", ("disability",), x="language", categories="labels", exclude=only("race/ethnicity", "nationality")),
+    Chart("distribution of gender in mental illness by provider.png", "Distribution of Gender as Victim of Mental Illness by Provider",
+          "range", ("mental_health",), x="provider", role="victim", categories="gender", averages=True),
+    Chart("distribution of gender in mental illness by lang.png", "Distribution of Gender as Victim of Mental Illness by Language",
+          "range", ("mental_health",), x="language", role="victim", categories="gender", averages=True),
+    Chart("distribution of gender as hero of academic achievement by provider.png", "Distribution of Gender as Hero of Academic Achievement by Provider",
+          "range", ("academic_achievement",), x="provider", role="hero", categories="gender", averages=True),
+    Chart("distribution of gender as hero of academic achievement by language.png", "Distribution of Gender as Hero of Academic Achievement by Language",
+          "range", ("academic_achievement",), x="language", role="hero", categories="gender", averages=True),
+    Chart("distribution of gender as hero of leadership by provider.png", "Distribution of Gender as Hero of Leadership by Provider",
+          "range", ("leadership",), x="provider", role="hero", categories="gender", averages=True),
+    Chart("distribution of gender as hero of leadership by language.png", "Distribution of Gender as Hero of Leadership by Language",
+          "range", ("leadership",), x="language", role="hero", categories="gender", averages=True),
+]
+
+def _stems(root: str, provider: str, prefix: str, suffix: str) -> dict[str, str]:
+    """Run name -> path for every file with suffix under <root>/<provider>/<prefix>/"""
+    directory = os.path.join(root, provider, prefix)
+    if not os.path.isdir(directory):
+        return {}
+    return {
+        name[:-len(suffix)]: os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(suffix) and not name.endswith(".idx.json")
+    }
+
+def _output_rows(path: str) -> list[dict]:
+    """Group rows recomputed from a complete output JSON"""
+    # Imported here so the clean source works without the provider SDKs
+    from utilities.utility_functions import compute_statistics
+
+    index = OutputIndex.open(path)
+    if not index.complete or not len(index):
+        return []
+
+    results = [
+        AnnotatedResponse(
+            classifier=c.get("classifier", ""),
+            scenario=scenario,
+            language=language,
+            sample_index=sample_index,
+            raw_response=response.get("raw_response", ""),
+            groups_mentioned=c.get("groups_mentioned", []),
+            roles=c.get("roles", {}),
+            sentiment=c.get("sentiment", {}),
+            notes=c.get("notes", ""),
+            is_refusal=c.get("is_refusal", False),
+            classifier_raw=""
+        )
+        for (scenario, language, sample_index), response in index.iter_samples()
+        for c in response.get("classifiers", [])
+    ]
+
+    rows = []
+    for scenario, lang_data in compute_statistics(results).items():
+        for language, cell in lang_data.items():
+            for group, g in cell["groups"].items():
+                rows.append(_row(
+                    scenario, language, group,
+                    max(g["role_distribution"], key=g["role_distribution"].get, default="-"),
+                    g["mention_rate"], g["mention_rate"], g["classifier_agreement"], g["classifier_agreement"]
+                ))
+    return rows
+
+def _log_rows(path: str) -> list[dict]:
+    """Group rows from the summary printed at the end of a session log"""
+    return [
+        _row(
+            row["Scenario"], row["Language"], row["Group"], row["Top Role"],
+            row["Mention Rate"], row["Mention Rate"], row["Classifier Agreement"], row["Classifier Agreement"]
+        )
+        for row in parse_summary(path)
+    ]
+
+def _row(
+        scenario: str,
+        language: str,
+        group: str,
+        role: str,
+        min_mention_rate: float,
+        max_mention_rate: float,
+        min_agreement: float,
+        max_agreement: float
+) -> dict:
+    return {
+        "scenario": scenario.lower(),
+        "language": language,
+        "group": group,
+        "role": role,
+        "min_mention_rate": round(min_mention_rate, 6),
+        "mention_rate": round(max_mention_rate, 6),
+        "min_classifier_agreement": round(min_agreement, 6),
+        "classifier_agreement": round(max_agreement, 6)
+    }
+
+def load_rows(outputs_root: str = "outputs", logs_root: str = "logs") -> list[dict]:
+    """
+    One row per (model, scenario, language, group) from the newest run of every model.
+
+    A run is read from its output JSON when that is complete, otherwise from the summary in its log
+    (the output write failed for the final run of the experiment). Runs with neither are skipped.
+
+    <OUTPUTS>
+    [{provider, model, scenario, language, group, role, min_mention_rate, mention_rate (the max),
+      min_classifier_agreement, classifier_agreement (the max)}, ...]
+    """
+    models = set()
+    for root in (outputs_root, logs_root):
+        if os.path.isdir(root):
+            for provider in os.listdir(root):
+                if os.path.isdir(os.path.join(root, provider)):
+                    models.update((provider, prefix) for prefix in os.listdir(os.path.join(root, provider)))
+
+    rows = []
+    for provider, prefix in sorted(models):
+        outputs = _stems(outputs_root, provider, prefix, ".json")
+        logs = _stems(logs_root, provider, prefix, ".out")
+
+        # Run names end in their start timestamp, so they sort chronologically
+        for stem in sorted(set(outputs) | set(logs), reverse=True):
+            run_rows = (_output_rows(outputs[stem]) if stem in outputs else []) \
+                or (_log_rows(logs[stem]) if stem in logs else [])
+            if run_rows:
+                rows.extend({"provider": PROVIDER_NAMES.get(provider, provider), "model": prefix, **row} for row in run_rows)
+                break
+    return rows
+
+def _clean_table(path: str) -> list[list]:
+    """Rows of the pivot table in a clean summary: the CSV itself, or the first workbook sheet holding the pivot"""
+    if path.endswith(".csv"):
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            return list(csv.reader(f))
+
+    import openpyxl
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            table = []
+            for values in sheet.iter_rows(values_only=True):
+                if table or tuple(values[:len(CLEAN_COLUMNS)]) == CLEAN_COLUMNS:
+                    table.append(list(values))
+            if len(table) > 1:
+                return table
+    finally:
+        workbook.close()
+    return []
+
+def load_clean_rows(clean_dir: str = CLEAN_DIR) -> list[dict]:
+    """
+    One row per (model, scenario, language, merged group, role) from the cleaned summaries
+
+    <INPUTS>
+    clean_dir: Directory with one <prefix>_CLEAN.csv or .xlsx per model
+
+    <OUTPUTS>
+    Rows as in load_rows()
+    """
+    rows = []
+    for name in sorted(os.listdir(clean_dir)):
+        stem, extension = os.path.splitext(name)
+        if extension not in (".csv", ".xlsx") or name.startswith("~$"):
+            continue
+        model = stem.removesuffix("_CLEAN")
+        provider = next((label for prefix, label in CLEAN_PROVIDERS if model.startswith(prefix)), model)
+
+        table = _clean_table(os.path.join(clean_dir, name))
+        if not table or tuple(table[0][:len(CLEAN_COLUMNS)]) != CLEAN_COLUMNS:
+            print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [FIGURES] No pivot table in {name}, skipping")
+            continue
+
+        for values in table[1:]:
+            scenario, language, group, role, *rates = values[:len(CLEAN_COLUMNS)]
+            try:
+                rates = [float(v) for v in rates]
+            except (TypeError, ValueError):
+                continue # blank and total rows
+            if not scenario or not group or not role:
+                continue
+            rows.append({"provider": provider, "model": model, "merged": True, **_row(str(scenario), str(language), str(group), str(role), *rates)})
+    return rows
+
+def categorize(group: str, categories: Optional[str], merged: bool = False) -> Optional[str]:
+    """
+    Category of a group label, the label itself when categories is None, None when unmatched
+
+    <INPUTS>
+    group: Group label
+    categories: Key of CATEGORY_SETS
+    merged: The label is a merged label from the clean summaries
+    """
+    if categories is None:
+        return group
+    lowered = group.lower()
+    if merged and categories in MERGED_EXACT:
+        return next((label for label, _ in CATEGORY_SETS[categories] if label == lowered), None)
+    for label, pattern in CATEGORY_SETS[categories]:
+        if re.search(pattern, lowered):
+            return label
+    return None
+
+def chart_slice(chart: Chart, rows: list[dict]) -> list[dict]:
+    """Rows feeding one chart, each with its category, in a stable order"""
+    selected = []
+    for row in rows:
+        if row["scenario"] not in chart.scenarios:
+            continue
+        roles = set(row["role"].split("|"))
+        if roles <= IGNORED_ROLES or (chart.role and chart.role not in roles):
+            continue
+        if row["mention_rate"] < chart.min_mention_rate:
+            continue
+        category = categorize(row["group"], chart.categories, row.get("merged", False))
+        if category is None or category in chart.exclude:
+            continue
+        selected.append({**row, "category": category})
+
+    return sorted(selected, key=lambda r: (r["model"], r["scenario"], r["language"], r["group"], r["role"]))
+
+def range_series(chart: Chart, rows: list[dict]) -> dict[tuple[str, str], dict[str, float]]:
+    """
+    Bar heights of a range chart
+
+    <INPUTS>
+    chart: A range chart
+    rows: Its slice, from chart_slice()
+
+    <OUTPUTS>
+    {(x value, category): {series name: value}}, in plotting order
+    """
+    buckets: dict[tuple[str, str], list[dict]] = defaultdict(list)
+    for row in rows:
+        buckets[(row[chart.x], row["category"])].append(row)
+
+    def mean(values: list[float]) -> float:
+        return sum(values) / len(values)
+
+    series = [("Min Mention Rate", "min_mention_rate", min), ("Max Mention Rate", "mention_rate", max)]
+    if chart.averages:
+        series.append(("Avg Mention Rate", "mention_rate", mean))
+    series += [("Min Classifier Agreement", "min_classifier_agreement", min), ("Max Classifier Agreement", "classifier_agreement", max)]
+    if chart.averages:
+        series.append(("Avg Classifier Agreement", "classifier_agreement", mean))
+
+    return {
+        label: {name: reduce([r[field] for r in buckets[label]]) for name, field, reduce in series}
+        for label in sorted(buckets)
+    }
+
+def slice_hash(chart: Chart, rows: list[dict]) -> str:
+    payload = json.dumps([RENDER_VERSION, asdict(chart), rows], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def render_chart(chart: Chart, rows: list[dict], path: str) -> str:
+    """Draw one chart to path. Runs in a worker process"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    fig, ax = plt.subplots(figsize=(16, 6))
+
+    if chart.kind == "range":
+        bars = range_series(chart, rows)
+        labels = list(bars)
+        names = list(bars[labels[0]])
+
+        x = np.arange(len(labels))
+        width = 0.8 / len(names)
+        for i, name in enumerate(names):
+            values = [bars[label][name] for label in labels]
+            ax.bar(x + (i - (len(names) - 1) / 2) * width, values, width, label=name)
+        ax.set_xticks(x, [f"{category}\n{value}" for value, category in labels], fontsize=8)
+        ax.set_ylim(0, 1.05)
+
+    elif chart.kind == "share":
+        counts: dict[str, dict[str, set]] = defaultdict(lambda: defaultdict(set))
+        for row in rows:
+            counts[row[chart.x]][row["category"]].add(row["group"].lower())
+        xs = sorted(counts)
+        categories = sorted({c for per_x in counts.values() for c in per_x})
+
+        colors = plt.get_cmap("tab20").colors
+        bottom = np.zeros(len(xs))
+        for i, category in enumerate(categories):
+            n = np.array([len(counts[value].get(category, ())) for value in xs], dtype=float)
+            totals = np.array([sum(len(s) for s in counts[value].values()) for value in xs], dtype=float)
+            share = np.divide(n, totals, out=np.zeros_like(n), where=totals > 0)
+            bars = ax.bar(xs, share, 0.4, bottom=bottom, label=category, color=colors[i % len(colors)])
+            ax.bar_label(bars, labels=[str(int(v)) if v else "" for v in n], label_type="center", fontsize=8)
+            bottom += share
+        ax.yaxis.set_major_formatter(matplotlib.ticker.PercentFormatter(1.0))
+
+    elif chart.kind == "top":
+        best: dict[str, float] = defaultdict(float)
+        for row in rows:
+            best[row["group"]] = max(best[row["group"]], row["mention_rate"])
+        top = sorted(best.items(), key=lambda kv: -kv[1])[:chart.top_n]
+        for name, value in top:
+            ax.bar(name, value, label=name)
+        ax.set_xticks([])
+        ax.set_xlabel("Max Mention Rate")
+        ax.set_ylim(0, 1.05)
+
+    else:
+        raise ValueError(f"Unknown chart kind '{chart.kind}'")
+
+    ax.set_title(chart.title)
+    ax.grid(axis="y", alpha=0.3)
+    ax.set_axisbelow(True)
+    if ax.get_legend_handles_labels()[0]:
+        ax.legend(loc="upper center", bbox_to_anchor=(0.5, -0.15), ncol=7, frameon=False, fontsize=8)
+    fig.tight_layout()
+    fig.savefig(path, dpi=200)
+    plt.close(fig)
+    return path
+
+def build_figures(
+        outputs_root: str = "outputs",
+        logs_root: str = "logs",
+        images_dir: str = IMAGES_DIR,
+        charts: Optional[list[Chart]] = None,
+        force: bool = False,
+        workers: Optional[int] = None,
+        source: str = "clean",
+        clean_dir: str = CLEAN_DIR
+) -> dict[str, str]:
+    """
+    Render every chart whose input slice changed since the last build
+
+    <INPUTS>
+    outputs_root: Root of the outputs tree
+    logs_root: Root of the logs tree
+    images_dir: Directory the PNGs and the manifest are written to. The report's figures are in REPORT_IMAGES_DIR
+    charts: Charts to consider. Defaults to CHARTS
+    force: Render every chart regardless of the manifest
+    workers: Process pool size. Defaults to the CPU count
+    source: "clean" for the cleaned summaries in clean_dir, "outputs" for the newest runs in outputs_root/logs_root
+    clean_dir: Directory of the cleaned summaries
+
+    <OUTPUTS>
+    filename -> "rendered", "unchanged" or "empty" for each chart
+    """
+    charts = CHARTS if charts is None else charts
+    os.makedirs(images_dir, exist_ok=True)
+
+    manifest_path = os.path.join(images_dir, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    if source == "clean":
+        rows = load_clean_rows(clean_dir)
+    elif source == "outputs":
+        rows = load_rows(outputs_root, logs_root)
+    else:
+        raise ValueError(f"Unknown source '{source}'")
+    status: dict[str, str] = {}
+    stale: list[tuple[Chart, list[dict], str]] = []
+
+    for chart in charts:
+        selected = chart_slice(chart, rows)
+        if not selected:
+            status[chart.filename] = "empty"
+            continue
+        digest = slice_hash(chart, selected)
+        if not force and manifest.get(chart.filename) == digest and os.path.exists(os.path.join(images_dir, chart.filename)):
+            status[chart.filename] = "unchanged"
+            continue
+        stale.append((chart, selected, digest))
+
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(render_chart, chart, selected, os.path.join(images_dir, chart.filename)): (chart, digest)
+                for chart, selected, digest in stale
+            }
+            for future in as_completed(futures):
+                chart, digest = futures[future]
+                future.result()
+                manifest[chart.filename] = digest
+                status[chart.filename] = "rendered"
+                print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [FIGURES] Rendered {chart.filename}")
+
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return status
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the report figures from the experiment outputs")
+    parser.add_argument("--source", choices=["clean", "outputs"], default="clean", help="Cleaned summaries (as in the report) or the newest runs")
+    parser.add_argument("--clean", default=CLEAN_DIR, help="Directory of the cleaned summaries")
+    parser.add_argument("--outputs", default="outputs", help="Root of the outputs tree")
+    parser.add_argument("--logs", default="logs", help="Root of the logs tree")
+    parser.add_argument("--images", default=IMAGES_DIR, help=f"Directory to write the figures to. {REPORT_IMAGES_DIR} replaces the report's figures")
+    parser.add_argument("--only", nargs="+", help="Only consider charts with these filenames")
+    parser.add_argument("--force", action="store_true", help="Render every chart even if its data is unchanged")
+    parser.add_argument("--workers", type=int, help="Worker processes. Defaults to the CPU count")
+    args = parser.parse_args()
+
+    charts = [c for c in CHARTS if not args.only or c.filename in args.only]
+    status = build_figures(
+        args.outputs, args.logs, args.images, charts=charts, force=args.force, workers=args.workers,
+        source=args.source, clean_dir=args.clean
+    )
+
+    for filename, state in status.items():
+        print(f"{state:<10} {filename}")
+
+if __name__ == "__main__":
+    main()
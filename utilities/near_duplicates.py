@@ -0,0 +1,202 @@
+"""
+MinHash/LSH near-duplicate detection for generated responses
+
+Responses are shingled into overlapping character n-grams after lowercasing and collapsing whitespace.
+Character shingles work the same way for languages written without spaces (zh, ja) as for the rest.
+Each response gets a MinHash signature. Signatures are split into bands for locality-sensitive hashing,
+so only responses that share a band are compared. A candidate counts as a near-duplicate when the
+estimated Jaccard similarity of the two shingle sets reaches the threshold.
+
+Used during a run (run_experiments with dedup_threshold) to let a near-duplicate reuse a representative's
+classifications, and after the fact to report response diversity per (scenario, language).
+
+Usage: python -m utilities.near_duplicates <output.json> [<output.json> ...] [--threshold 0.9]
+"""
+
+import re
+import zlib
+import argparse
+from typing import Hashable, Optional
+
+import numpy as np
+
+from utilities.output_index import OutputIndex
+from utilities.BlobStore import BlobStore
+
+# Mersenne prime for the universal hashes; keeps a * x + b inside uint64
+_PRIME = (1 << 31) - 1
+_WHITESPACE = re.compile(r"\s+")
+
+class NearDuplicateIndex:
+    """
+    Near-duplicate index over the responses of one (model, scenario, language) cell.
+
+    Only representatives are stored: add() either matches the text to an earlier representative
+    or stores it as a new one, so every match points at a response that is classified itself.
+
+    With bands * rows = num_perm, a pair with Jaccard similarity s becomes a candidate with probability
+    1 - (1 - s^rows)^bands. The defaults (16 bands of 8) make pairs at 0.9 candidates more than 99.9% of the time.
+    """
+    def __init__(
+            self,
+            threshold: float = 0.9,
+            num_perm: int = 128,
+            bands: int = 16,
+            shingle_size: int = 5,
+            seed: int = 1
+    ):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+
+        self._signatures: dict[Hashable, np.ndarray] = {}
+        self._buckets: list[dict[bytes, list[Hashable]]] = [{} for _ in range(bands)]
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def shingles(self, text: str) -> set[str]:
+        text = _WHITESPACE.sub(" ", text.lower()).strip()
+        if len(text) <= self.shingle_size:
+            return {text} if text else set()
+        return {text[i:i + self.shingle_size] for i in range(len(text) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of text. All-max for empty text, which matches nothing"""
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) & _PRIME for s in self.shingles(text)),
+            dtype=np.uint64
+        )
+        if not hashes.size:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _PRIME).min(axis=1)
+
+    @staticmethod
+    def similarity(a: np.ndarray, b: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+        return float(np.mean(a == b))
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def query(self, text: str) -> Optional[tuple[Hashable, float]]:
+        """Most similar representative at or above the threshold, as (key, similarity), or None"""
+        return self._query(self.signature(text))
+
+    def _query(self, signature: np.ndarray) -> Optional[tuple[Hashable, float]]:
+        candidates = set()
+        for band, key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(band.get(key, ()))
+
+        best = None
+        for candidate in candidates:
+            score = self.similarity(signature, self._signatures[candidate])
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (candidate, score)
+        return best
+
+    def add(self, key: Hashable, text: str) -> Optional[tuple[Hashable, float]]:
+        """
+        Match text against the stored representatives, storing it as a new representative when nothing matches
+
+        <INPUTS>
+        key: Identifier for text, e.g. its sample index
+        text: Response text
+
+        <OUTPUTS>
+        (representative key, similarity) when text is a near-duplicate, otherwise None
+        """
+        signature = self.signature(text)
+        match = self._query(signature)
+        if match is not None:
+            return match
+
+        self._signatures[key] = signature
+        for band, band_key in zip(self._buckets, self._band_keys(signature)):
+            band.setdefault(band_key, []).append(key)
+        return None
+
+def response_diversity(texts: list[str], threshold: float = 0.9) -> dict:
+    """
+    Diversity of one cell's responses. Empty responses (API errors) are skipped
+
+    <INPUTS>
+    texts: Responses of one (model, scenario, language) cell
+    threshold: Similarity at which two responses count as near-duplicates
+
+    <OUTPUTS>
+    {
+      "samples": Non-empty responses,
+      "clusters": Near-duplicate clusters (representatives),
+      "distinct_ratio": clusters / samples; 1.0 when no response is a near-duplicate of another,
+      "mean_similarity": Mean estimated Jaccard similarity over all pairs,
+      "duplicate_pairs": Pairs at or above the threshold
+    }
+    """
+    index = NearDuplicateIndex(threshold=threshold)
+    signatures = []
+    for i, text in enumerate(t for t in texts if t):
+        index.add(i, text)
+        signatures.append(index.signature(text))
+
+    n = len(signatures)
+    if not n:
+        return {"samples": 0, "clusters": 0, "distinct_ratio": None, "mean_similarity": None, "duplicate_pairs": 0}
+
+    matrix = np.stack(signatures)
+    similarities = [
+        NearDuplicateIndex.similarity(matrix[i], matrix[j])
+        for i in range(n) for j in range(i + 1, n)
+    ]
+    return {
+        "samples": n,
+        "clusters": len(index),
+        "distinct_ratio": len(index) / n,
+        "mean_similarity": float(np.mean(similarities)) if similarities else None,
+        "duplicate_pairs": sum(1 for s in similarities if s >= threshold)
+    }
+
+def output_diversity(path: str, threshold: float = 0.9) -> dict[str, dict[str, dict]]:
+    """
+    response_diversity() for every (scenario, language) of an output JSON.
+    Read through the byte-offset index, so truncated files report their complete samples
+
+    <OUTPUTS>
+    {scenario: {language: response_diversity()}}
+    """
+    store = BlobStore.for_output(path)
+    texts: dict[str, dict[str, list[str]]] = {}
+    for (scenario, language, _), response in OutputIndex.open(path).iter_samples():
+        text = response.get("raw_response") or ""
+        texts.setdefault(scenario, {}).setdefault(language, []).append(store.resolve(text) if store else text)
+
+    return {
+        scenario: {language: response_diversity(cell, threshold) for language, cell in languages.items()}
+        for scenario, languages in texts.items()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Response diversity per scenario and language from near-duplicate clustering")
+    parser.add_argument("files", nargs="+", help="Output JSON files")
+    parser.add_argument("--threshold", type=float, default=0.9, help="Estimated Jaccard similarity at which responses are near-duplicates")
+    args = parser.parse_args()
+
+    for path in args.files:
+        print(f"\n{path}")
+        print(f"{'Scenario':<24}{'Lang':<6}{'Samples':>8}{'Clusters':>10}{'Distinct':>10}{'Mean sim':>10}{'Dup pairs':>11}")
+        for scenario, languages in output_diversity(path, args.threshold).items():
+            for language, d in languages.items():
+                distinct = f"{d['distinct_ratio']:.0%}" if d["distinct_ratio"] is not None else "-"
+                mean = f"{d['mean_similarity']:.3f}" if d["mean_similarity"] is not None else "-"
+                print(f"{scenario:<24}{language:<6}{d['samples']:>8}{d['clusters']:>10}{distinct:>10}{mean:>10}{d['duplicate_pairs']:>11}")
+
+if __name__ == "__main__":
+    main()
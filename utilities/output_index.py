@@ -0,0 +1,224 @@
+"""
+Byte-offset index for random access into output JSON files written by save_results
+
+The index is built once per output file by scanning its structural tokens through mmap
+(no document is materialized) and is stored next to it as <file>.idx.json. It maps
+(scenario, language, sample_index) to the byte range of that sample's response object,
+so a reader can seek straight to one sample and decode only that fragment.
+Truncated outputs are indexed up to the last complete sample.
+
+Usage: python -m utilities.output_index <output.json> [--list] [--scenario S --language L --sample N] [--field raw_response] [--rebuild]
+"""
+
+import os
+import re
+import sys
+import json
+import mmap
+import argparse
+from typing import Iterator, Optional
+
+INDEX_SUFFIX = ".idx.json"
+INDEX_VERSION = 1
+
+# Strings (with escapes) and structural characters. Multi-byte UTF-8 never contains these bytes
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]:,]', re.DOTALL)
+_INTEGER = re.compile(rb'\s*(-?\d+)')
+
+# Container path from the root object down to a response object
+_RESPONSE_PATH = ("scenarios", None, "languages", None, "responses", None)
+
+def index_path_for(path: str) -> str:
+    return path + INDEX_SUFFIX
+
+def build_index(path: str) -> dict:
+    """
+    Scan an output JSON and return its index
+
+    <INPUTS>
+    path: Path to the output JSON
+
+    <OUTPUTS>
+    {version, source_size, source_mtime_ns, complete, entries: [[scenario, language, sample_index, start, end], ...]}
+    """
+    stat = os.stat(path)
+    entries: list[list] = []
+    complete = True
+
+    with open(path, "rb") as f:
+        if stat.st_size == 0:
+            return _index(stat, [], False)
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            # Each frame is [is_object, current key]
+            stack: list[list] = []
+            expecting_key = False
+            scenario: Optional[str] = None
+            language: Optional[str] = None
+            response: Optional[list] = None
+
+            for m in _TOKEN.finditer(buf):
+                token = m.group()
+                first = token[0:1]
+
+                if first == b'"':
+                    if stack and stack[-1][0] and expecting_key:
+                        stack[-1][1] = json.loads(token)
+                        expecting_key = False
+                    elif len(stack) == 3 and stack[-1][1] == "scenario" and _in_path(stack[:-1]):
+                        scenario = json.loads(token)
+                    elif len(stack) == 5 and stack[-1][1] == "language" and _in_path(stack[:-1]):
+                        language = json.loads(token)
+                elif first == b"{":
+                    stack.append([True, None])
+                    expecting_key = True
+                    if len(stack) == 7 and _in_path(stack[:-1]):
+                        response = [scenario, language, None, m.start(), None]
+                elif first == b"[":
+                    stack.append([False, None])
+                elif first == b":":
+                    if response is not None and len(stack) == 7 and stack[-1][1] == "sample_index":
+                        number = _INTEGER.match(buf, m.end())
+                        if number:
+                            response[2] = int(number.group(1))
+                elif first == b",":
+                    expecting_key = bool(stack) and stack[-1][0]
+                else: # closing } or ]
+                    if len(stack) == 7 and response is not None:
+                        response[4] = m.end()
+                        entries.append(response)
+                        response = None
+                    stack.pop()
+                    expecting_key = False
+
+            complete = not stack
+
+    return _index(stat, entries, complete)
+
+def _in_path(stack: list[list]) -> bool:
+    """True if the open containers follow the scenarios/languages/responses path so far"""
+    return all(expected is None or frame[1] == expected for frame, expected in zip(stack, _RESPONSE_PATH))
+
+def _index(stat: os.stat_result, entries: list[list], complete: bool) -> dict:
+    return {
+        "version": INDEX_VERSION,
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "complete": complete,
+        "entries": entries
+    }
+
+class OutputIndex:
+    """Random access reader over one output JSON through its sidecar index"""
+    def __init__(self, path: str, index: dict):
+        self.path = path
+        self.complete = index["complete"]
+        self._ranges: dict[tuple[str, str, int], tuple[int, int]] = {
+            (scenario, language, sample_index): (start, end)
+            for scenario, language, sample_index, start, end in index["entries"]
+        }
+
+    @classmethod
+    def open(cls, path: str, rebuild: bool = False, save: bool = True) -> "OutputIndex":
+        """
+        Load the sidecar index for path, building and saving it if missing or stale
+
+        <INPUTS>
+        path: Path to the output JSON
+        rebuild: Always rebuild the index
+        save: Write a rebuilt index to the sidecar. False keeps read-only callers from writing into outputs/
+        """
+        sidecar = index_path_for(path)
+        stat = os.stat(path)
+
+        if not rebuild and os.path.exists(sidecar):
+            with open(sidecar, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if (index.get("version") == INDEX_VERSION
+                    and index.get("source_size") == stat.st_size
+                    and index.get("source_mtime_ns") == stat.st_mtime_ns):
+                return cls(path, index)
+
+        index = build_index(path)
+        if save:
+            with open(sidecar, "w", encoding="utf-8") as f:
+                json.dump(index, f, ensure_ascii=False)
+        return cls(path, index)
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def keys(self) -> list[tuple[str, str, int]]:
+        """Every (scenario, language, sample_index) in file order"""
+        return list(self._ranges)
+
+    def read_sample(self, scenario: str, language: str, sample_index: int) -> dict:
+        """
+        Decode one sample's response object
+
+        <INPUTS>
+        scenario: Scenario name
+        language: Language code
+        sample_index: Sample index within the (scenario, language) cell
+        """
+        key = (scenario, language, sample_index)
+        if key not in self._ranges:
+            raise KeyError(f"No sample {key} in {self.path}")
+
+        start, end = self._ranges[key]
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return json.loads(f.read(end - start))
+
+    def iter_samples(self, scenario: Optional[str] = None, language: Optional[str] = None) -> Iterator[tuple[tuple[str, str, int], dict]]:
+        """Yield (key, response) for every sample, optionally filtered, reading one fragment at a time"""
+        with open(self.path, "rb") as f:
+            for key, (start, end) in self._ranges.items():
+                if (scenario and key[0] != scenario) or (language and key[1] != language):
+                    continue
+                f.seek(start)
+                yield key, json.loads(f.read(end - start))
+
+def main():
+    parser = argparse.ArgumentParser(description="Random access into output JSON files through a byte-offset index")
+    parser.add_argument("file", help="Output JSON file")
+    parser.add_argument("--list", action="store_true", help="List indexed samples per scenario and language")
+    parser.add_argument("--scenario")
+    parser.add_argument("--language")
+    parser.add_argument("--sample", type=int, help="Sample index to print")
+    parser.add_argument("--field", help="Print only this field of the sample, e.g. raw_response")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the index even if it is up to date")
+    args = parser.parse_args()
+
+    index = OutputIndex.open(args.file, rebuild=args.rebuild)
+    if not index.complete:
+        print(f"Warning: {args.file} is truncated, {len(index):,} complete samples indexed", file=sys.stderr)
+
+    if args.sample is None or args.list:
+        counts: dict[tuple[str, str], int] = {}
+        for scenario, language, _ in index.keys():
+            counts[(scenario, language)] = counts.get((scenario, language), 0) + 1
+        for (scenario, language), count in counts.items():
+            if (args.scenario and scenario != args.scenario) or (args.language and language != args.language):
+                continue
+            print(f"{scenario} | {language} | {count} samples")
+        return
+
+    if not args.scenario or not args.language:
+        print("[ERROR] --sample requires --scenario and --language")
+        sys.exit(1)
+
+    try:
+        sample = index.read_sample(args.scenario, args.language, args.sample)
+    except KeyError as e:
+        print(f"[ERROR] {e.args[0]}")
+        sys.exit(1)
+
+    if args.field:
+        value = sample.get(args.field)
+        print(value if isinstance(value, str) else json.dumps(value, indent=2, ensure_ascii=False))
+    else:
+        print(json.dumps(sample, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Dry-run planner: expands the experiment grid without any network calls and estimates call volume,
+wall time and tokens from earlier runs
+
+Latencies are mined from the session logs in logs/. The log prints one line when a sample starts and
+one line after each classifier, so with one-second timestamps:
+
+  first classifier line - sample line      = generation + first classifier (measured together)
+  classifier line - previous classifier    = that classifier's latency
+
+Text lengths are mined from the output JSONs in outputs/ through the byte-offset index, so truncated
+files still contribute their complete samples. Tokens are estimated from characters.
+"""
+
+import os
+import re
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from utilities.output_index import OutputIndex, INDEX_SUFFIX
+from utilities.BlobStore import BlobStore
+
+CHARS_PER_TOKEN = 4.0
+CLASSIFIER_PREFIX = "Text to annotate:\n\n"
+
+# Intervals longer than this are stalls (outages, retries, machine asleep), not latency
+MAX_INTERVAL = 600
+
+_LINE = re.compile(r"^(\d\d/\d\d/\d{4} \d\d:\d\d:\d\d) \[([A-Z ]+)\] ?(.*)$")
+_SAMPLE = re.compile(r"^Sample \d+/\d+$")
+_CLASSIFIER = re.compile(r"^Classifier: (\S+) \|")
+
+@dataclass
+class History:
+    """Latencies (seconds) and text lengths (characters) from earlier runs"""
+    # (prefix, first classifier) -> generation + first classifier latencies
+    generation: dict[tuple[str, str], list[float]] = field(default_factory=lambda: defaultdict(list))
+    # classifier model -> latencies, when it was not the first classifier
+    classifier: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    # (prefix, language) -> generated response lengths
+    response_chars: dict[tuple[str, str], list[int]] = field(default_factory=lambda: defaultdict(list))
+    # classifier model -> raw classifier output lengths
+    classifier_chars: dict[str, list[int]] = field(default_factory=lambda: defaultdict(list))
+    log_files: int = 0
+    output_files: int = 0
+
+def _mean(values: list[float]) -> Optional[float]:
+    return sum(values) / len(values) if values else None
+
+def _files(root: str, suffix: str) -> list[str]:
+    paths = []
+    for directory, _, filenames in os.walk(root):
+        paths.extend(os.path.join(directory, name) for name in filenames if name.endswith(suffix))
+    return sorted(paths)
+
+def _prefix_of(path: str) -> str:
+    """<root>/<provider>/<prefix>/<file> -> prefix"""
+    return os.path.basename(os.path.dirname(path))
+
+def mine_logs(history: History, log_dir: str):
+    """
+    Add per-call latencies from every .out log under log_dir to history
+
+    <INPUTS>
+    history: History to add to
+    log_dir: Root of the logs tree, e.g. logs
+    """
+    for path in _files(log_dir, ".out"):
+        prefix = _prefix_of(path)
+        history.log_files += 1
+
+        sample_start: Optional[datetime] = None
+        previous: Optional[datetime] = None
+        generation_failed = False
+        call_failed = False
+
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                m = _LINE.match(line)
+                if not m:
+                    continue
+                timestamp = datetime.strptime(m.group(1), "%m/%d/%Y %H:%M:%S")
+                tag, message = m.group(2), m.group(3)
+
+                if tag == "EXPERIMENT" and _SAMPLE.match(message):
+                    sample_start, previous = timestamp, None
+                    generation_failed = call_failed = False
+                elif tag.endswith("API ERROR"):
+                    # No response, so the classifiers are skipped for this sample
+                    generation_failed = True
+                elif tag in ("CLASSIFIER ERROR", "CIRCUIT"):
+                    # Failed or held calls return early, their timing is not a latency
+                    call_failed = True
+                elif tag == "EXPERIMENT" and sample_start is not None and not generation_failed:
+                    c = _CLASSIFIER.match(message)
+                    if not c:
+                        continue
+                    classifier = c.group(1)
+                    interval = (timestamp - (previous or sample_start)).total_seconds()
+                    if not call_failed and interval <= MAX_INTERVAL:
+                        if previous is None:
+                            history.generation[(prefix, classifier)].append(interval)
+                        else:
+                            history.classifier[classifier].append(interval)
+                    previous = timestamp
+                    call_failed = False
+
+def mine_outputs(history: History, output_dir: str):
+    """
+    Add response and classifier output lengths from every output JSON under output_dir to history
+
+    <INPUTS>
+    history: History to add to
+    output_dir: Root of the outputs tree, e.g. outputs
+    """
+    for path in _files(output_dir, ".json"):
+        if path.endswith(INDEX_SUFFIX):
+            continue
+        prefix = _prefix_of(path)
+        try:
+            # A dry run reads existing sidecars but never writes into outputs/
+            index = OutputIndex.open(path, save=False)
+        except (OSError, ValueError):
+            continue
+        if not len(index):
+            continue
+        history.output_files += 1
+        store = BlobStore.for_output(path)
+
+        for (_, language, _), response in index.iter_samples():
+            text = response.get("raw_response") or ""
+            if not text:
+                continue
+            if store:
+                text = store.resolve(text)
+            history.response_chars[(prefix, language)].append(len(text))
+            for entry in response.get("classifiers", []):
+                raw = store.resolve(entry.get("classifier_raw")) if store else entry.get("classifier_raw")
+                # Skip failed calls: errors were stored as strings (or objects, in older runs)
+                if isinstance(raw, str) and raw.lstrip().startswith(("{", "`")):
+                    history.classifier_chars[entry.get("classifier", "")].append(len(raw))
+
+def load_history(log_dir: str, output_dir: str) -> History:
+    history = History()
+    mine_logs(history, log_dir)
+    mine_outputs(history, output_dir)
+    return history
+
+def _tokens(chars: float) -> float:
+    return chars / CHARS_PER_TOKEN
+
+def _duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "unknown"
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}h {rest // 60:02d}m"
+
+def plan_run(
+        targets: list[tuple[str, str, str]],
+        classifiers: list[tuple[str, str]],
+        prompts: dict[str, dict[str, str]],
+        samples_per_prompt: int,
+        system_prompt: str,
+        classifier_system: str,
+        scenarios: Optional[list[str]] = None,
+        languages: Optional[list[str]] = None,
+        rate_limit_delay: float = 0.5,
+        log_dir: str = "logs",
+        output_dir: str = "outputs",
+        generation_batch_size: int = 1,
+        native_batch: Optional[set[str]] = None
+) -> dict:
+    """
+    Expand the grid and estimate calls, wall time and tokens for each target model, then print the plan
+
+    Wall time is given for both ways of launching: main.py runs the target models one after another,
+    launcher.py runs one process per target model. Parallel processes share the classifier providers,
+    so the launcher estimate is a lower bound when those providers rate limit.
+
+    <INPUTS>
+    targets: (target model, provider, prefix) for each target model
+    classifiers: (classifier model, provider) in the order they are called
+    prompts: Scenario -> language -> prompt, as in prompts/prompts.json
+    samples_per_prompt: Samples per (scenario, language)
+    system_prompt: Target model system prompt
+    classifier_system: Classifier system prompt
+    scenarios: Subset of scenarios. Defaults to all
+    languages: Subset of languages. Defaults to all available
+    rate_limit_delay: Seconds slept after each sample
+    log_dir: Root of the logs tree to mine latencies from
+    output_dir: Root of the outputs tree to mine lengths from
+    generation_batch_size: Completions requested together, as in run_experiments
+    native_batch: Providers that return a whole batch from one request (n). Elsewhere a batch is parallel single calls
+
+    <OUTPUTS>
+    {
+      "targets": {prefix: {samples, seconds, generation_calls, ...}},
+      "providers": {provider: {calls, input_tokens, output_tokens}},
+      "sequential_seconds", "parallel_seconds"
+    }
+    """
+    history = load_history(log_dir, output_dir)
+    first_classifier = classifiers[0][0] if classifiers else None
+
+    all_generation = [v for values in history.generation.values() for v in values]
+    all_classifier = [v for values in history.classifier.values() for v in values]
+    all_response_chars = [v for values in history.response_chars.values() for v in values]
+    all_classifier_chars = [v for values in history.classifier_chars.values() for v in values]
+
+    providers: dict[str, dict[str, float]] = defaultdict(lambda: {"calls": 0, "input_tokens": 0.0, "output_tokens": 0.0})
+    plan = {"targets": {}, "providers": providers, "generation_batch_size": generation_batch_size, "native_batch": sorted(native_batch or [])}
+
+    for target_model, provider, prefix in targets:
+        # Grid: every (scenario, language) with a prompt
+        cells = []
+        for scenario in scenarios or list(prompts.keys()):
+            for language in languages or list(prompts[scenario].keys()):
+                if language in prompts.get(scenario, {}):
+                    cells.append((scenario, language))
+        samples = len(cells) * samples_per_prompt
+        batch_size = max(1, min(generation_batch_size, samples_per_prompt))
+        batches_per_cell = math.ceil(samples_per_prompt / batch_size) if samples_per_prompt else 0
+        batches = len(cells) * batches_per_cell
+        native = batch_size > 1 and provider in (native_batch or set())
+
+        # Generation + first classifier, from this target's runs when possible
+        generation = history.generation.get((prefix, first_classifier)) \
+            or [v for (p, _), values in history.generation.items() if p == prefix for v in values] \
+            or all_generation
+        sample_seconds = _mean(generation) if classifiers else None
+
+        # A batch waits for its generation latency once instead of once per sample. The logs time generation
+        # together with the first classifier, so generation alone is what is left after that classifier's mean
+        generation_seconds = None
+        if sample_seconds is not None and batch_size > 1:
+            first_latency = _mean(history.classifier.get(first_classifier, [])) or _mean(all_classifier)
+            if first_latency is not None:
+                generation_seconds = max(0.0, sample_seconds - first_latency)
+
+        response_chars = 0.0
+        for scenario, language in cells:
+            chars = _mean(history.response_chars.get((prefix, language), [])) \
+                or _mean([v for (p, _), values in history.response_chars.items() if p == prefix for v in values]) \
+                or _mean(all_response_chars) or 0.0
+            response_chars += chars * samples_per_prompt
+
+            prompt_chars = len(system_prompt) + len(prompts[scenario][language])
+            # The prompt is sent once per request
+            providers[provider]["input_tokens"] += _tokens(prompt_chars) * (batches_per_cell if native else samples_per_prompt)
+        generation_calls = batches if native else samples
+        providers[provider]["calls"] += generation_calls
+        providers[provider]["output_tokens"] += _tokens(response_chars)
+
+        for i, (classifier_model, classifier_provider) in enumerate(classifiers):
+            if i and sample_seconds is not None:
+                latency = _mean(history.classifier.get(classifier_model, [])) or _mean(all_classifier)
+                sample_seconds = sample_seconds + latency if latency is not None else None
+
+            output_chars = _mean(history.classifier_chars.get(classifier_model, [])) or _mean(all_classifier_chars) or 0.0
+            input_chars = (len(classifier_system) + len(CLASSIFIER_PREFIX)) * samples + response_chars
+            providers[classifier_provider]["calls"] += samples
+            providers[classifier_provider]["input_tokens"] += _tokens(input_chars)
+            providers[classifier_provider]["output_tokens"] += _tokens(output_chars) * samples
+
+        seconds = (sample_seconds + rate_limit_delay) * samples if sample_seconds is not None else None
+        if seconds is not None and generation_seconds is not None:
+            seconds -= generation_seconds * (samples - batches)
+        plan["targets"][prefix] = {
+            "target_model": target_model,
+            "provider": provider,
+            "cells": len(cells),
+            "samples": samples,
+            "generation_calls": generation_calls,
+            "classifier_calls": samples * len(classifiers),
+            "seconds_per_sample": sample_seconds,
+            "seconds": seconds,
+            "history_samples": len(generation)
+        }
+
+    known = [t["seconds"] for t in plan["targets"].values() if t["seconds"] is not None]
+    plan["sequential_seconds"] = sum(known) if known else None
+    plan["parallel_seconds"] = max(known) if known else None
+    plan["providers"] = dict(providers)
+
+    print_plan(plan, history)
+    return plan
+
+def print_plan(plan: dict, history: History):
+    print("=" * 70)
+    print("EXPERIMENT PLAN (dry run, no API calls)")
+    print("=" * 70)
+    print(f"History: {history.log_files} logs, {history.output_files} outputs with complete samples")
+
+    print(f"\n{'Target':<24}{'Samples':>9}{'Gen calls':>11}{'Cls calls':>11}{'s/sample':>10}{'Wall time':>12}")
+    for prefix, t in plan["targets"].items():
+        per_sample = f"{t['seconds_per_sample']:.1f}" if t["seconds_per_sample"] is not None else "-"
+        print(f"{prefix:<24}{t['samples']:>9,}{t['generation_calls']:>11,}{t['classifier_calls']:>11,}{per_sample:>10}{_duration(t['seconds']):>12}")
+
+    print(f"\n{'Provider':<24}{'Calls':>9}{'Input tok':>14}{'Output tok':>14}")
+    for provider, p in plan["providers"].items():
+        print(f"{provider:<24}{p['calls']:>9,}{p['input_tokens']:>14,.0f}{p['output_tokens']:>14,.0f}")
+
+    print(f"\nWall time, sequential (main.py):            {_duration(plan['sequential_seconds'])}")
+    print(f"Wall time, one process per model (launcher): {_duration(plan['parallel_seconds'])}")
+    if plan["generation_batch_size"] > 1:
+        native = ", ".join(plan["native_batch"]) or "none"
+        print(f"Generation batch size {plan['generation_batch_size']}: one request per batch for {native}, parallel single calls elsewhere")
+    print(f"Tokens are estimated at {CHARS_PER_TOKEN:.0f} characters per token")
@@ -0,0 +1,454 @@
+"""
+Bootstrap confidence intervals and permutation tests over annotated results, vectorized with NumPy
+
+Each (provider, scenario, language) cell is encoded as a sample x feature matrix of numerators and
+denominators, so every reported rate is sum(numerator) / sum(denominator) over samples:
+  refusal_rate          numerator = sample refused (first annotation, as in compute_statistics), denominator = 1
+  mention_rate[group]   numerator = >= 1 classifier mentioned the group, denominator = 1
+  role[group][role]     numerator = classifiers giving that role, denominator = classifiers mentioning the group
+  sentiment[group][s]   same as role, for sentiment
+Resampling samples is then a weight matrix product, done for all cells and resamples at once.
+
+Usage: python -m utilities.significance <output.json> [<output.json> ...] [--resamples 2000] [--permutations 5000] [--output report.json]
+"""
+
+import sys
+import json
+import time
+import argparse
+from dataclasses import dataclass, field
+from collections import defaultdict
+from itertools import combinations
+from typing import Optional
+
+import numpy as np
+
+from utilities.data_structures import AnnotatedResponse
+
+# Upper bound on elements per intermediate array, keeps peak memory around a few hundred MB
+_CHUNK_ELEMENTS = 20_000_000
+
+@dataclass
+class CellMatrix:
+    """Sample x feature encoding of one (provider, scenario, language) cell"""
+    provider: str
+    scenario: str
+    language: str
+    # (kind, group, label) per column. kind is refusal_rate, mention_rate, role or sentiment
+    features: list[tuple[str, str, str]] = field(default_factory=list)
+    numerators: np.ndarray = None   # (samples, features)
+    denominators: np.ndarray = None # (samples, features)
+
+    @property
+    def n_samples(self) -> int:
+        return self.numerators.shape[0]
+
+    def estimates(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.numerators.sum(axis=0) / self.denominators.sum(axis=0)
+
+def encode_cells(results: list[AnnotatedResponse], provider: str = "") -> list[CellMatrix]:
+    """
+    Encode annotated results into one CellMatrix per (scenario, language)
+
+    <INPUTS>
+    results: Annotated results from run_experiments() or load_results()
+    provider: Label for the target model that produced the results
+    """
+    # scenario -> language -> sample_index -> list of annotations
+    grouped: dict = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+    for r in results:
+        grouped[r.scenario][r.language][r.sample_index].append(r)
+
+    cells = []
+    for scenario, lang_data in grouped.items():
+        for language, sample_data in lang_data.items():
+            columns: dict[tuple[str, str, str], int] = {("refusal_rate", "", ""): 0}
+            entries: list[tuple[int, int, float]] = [] # (row, column, numerator)
+            row_mentions: list[dict[str, int]] = []
+
+            for row, sample_index in enumerate(sorted(sample_data)):
+                annotations = sample_data[sample_index]
+                entries.append((row, 0, float(annotations[0].is_refusal)))
+
+                mention_counts: dict[str, int] = defaultdict(int)
+                label_counts: dict[tuple[str, str, str], int] = defaultdict(int)
+                for a in annotations:
+                    for group in a.groups_mentioned:
+                        mention_counts[group] += 1
+                        label_counts[("role", group, a.roles.get(group, "unspecified"))] += 1
+                        label_counts[("sentiment", group, a.sentiment.get(group, "neutral"))] += 1
+                row_mentions.append(mention_counts)
+
+                for key, count in [(("mention_rate", g, ""), 1) for g in mention_counts] + list(label_counts.items()):
+                    column = columns.setdefault(key, len(columns))
+                    entries.append((row, column, float(count)))
+
+            n, f = len(sample_data), len(columns)
+            numerators = np.zeros((n, f))
+            rows, cols, values = (np.array(x) for x in zip(*entries))
+            numerators[rows.astype(np.int64), cols.astype(np.int64)] = values
+
+            # Refusal and mention rates are per-sample means. Role/sentiment shares are
+            # divided by the number of classifiers that mentioned the group in each sample
+            denominators = np.ones((n, f))
+            for (kind, group, _), column in columns.items():
+                if kind in ("role", "sentiment"):
+                    denominators[:, column] = [counts.get(group, 0) for counts in row_mentions]
+
+            cells.append(CellMatrix(
+                provider=provider,
+                scenario=scenario,
+                language=language,
+                features=list(columns),
+                numerators=numerators,
+                denominators=denominators
+            ))
+
+    return cells
+
+def _stack(cells: list[CellMatrix]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Zero-pad cells into (cells, max samples, max features) arrays plus the sample counts"""
+    n = np.array([c.n_samples for c in cells], dtype=np.int64)
+    n_max = int(n.max()) if len(n) else 0
+    f_max = max((len(c.features) for c in cells), default=0)
+
+    num = np.zeros((len(cells), n_max, f_max))
+    den = np.zeros((len(cells), n_max, f_max))
+    for i, c in enumerate(cells):
+        num[i, :c.n_samples, :len(c.features)] = c.numerators
+        den[i, :c.n_samples, :len(c.features)] = c.denominators
+    return num, den, n
+
+def _resample_weights(rng: np.random.Generator, n: np.ndarray, resamples: int, n_max: int) -> np.ndarray:
+    """
+    Bootstrap weights for a batch of cells: (cells, resamples, n_max) counts of how often each
+    sample was drawn. Each cell draws n[i] samples with replacement from its first n[i] rows.
+    """
+    c = len(n)
+    draws = (rng.random((c, resamples, n_max)) * n[:, None, None]).astype(np.int64)
+    valid = np.broadcast_to(np.arange(n_max)[None, None, :] < n[:, None, None], draws.shape)
+    offsets = (np.arange(c * resamples, dtype=np.int64) * n_max).reshape(c, resamples, 1)
+    weights = np.bincount((draws + offsets).ravel(), weights=valid.ravel(), minlength=c * resamples * n_max)
+    return weights.reshape(c, resamples, n_max)
+
+def _width_batches(widths: list[int], repeats: int) -> list[list[int]]:
+    """
+    Group item indices into batches of similar width so zero-padding stays small,
+    with each batch's (items x repeats x width) under _CHUNK_ELEMENTS
+    """
+    order = sorted(range(len(widths)), key=lambda i: widths[i])
+    batches, current, width = [], [], 0
+    for i in order:
+        candidate = max(width, widths[i])
+        if current and (len(current) + 1) * repeats * candidate > _CHUNK_ELEMENTS:
+            batches.append(current)
+            current, candidate = [], widths[i]
+        current.append(i)
+        width = candidate
+    if current:
+        batches.append(current)
+    return batches
+
+def _nan_quantiles(values: np.ndarray, quantiles: list[float], axis: int) -> np.ndarray:
+    """
+    Linear-interpolated quantiles ignoring NaN, fully vectorized.
+    np.nanquantile falls back to a Python loop over every slice.
+    """
+    ordered = np.sort(values, axis=axis) # NaN sorts last
+    valid = (~np.isnan(values)).sum(axis=axis, keepdims=True)
+    out = []
+    for q in quantiles:
+        pos = np.maximum(valid - 1, 0) * q
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, np.maximum(valid - 1, 0))
+        frac = pos - lo
+        lower = np.take_along_axis(ordered, lo, axis=axis)
+        upper = np.take_along_axis(ordered, hi, axis=axis)
+        result = lower + (upper - lower) * frac
+        out.append(np.where(valid > 0, result, np.nan).squeeze(axis))
+    return np.stack(out)
+
+def bootstrap_intervals(
+        cells: list[CellMatrix],
+        resamples: int = 2000,
+        confidence: float = 0.95,
+        seed: int = 0
+) -> list[dict]:
+    """
+    Percentile bootstrap intervals for every feature of every cell
+
+    <INPUTS>
+    cells: Encoded cells from encode_cells()
+    resamples: Number of bootstrap resamples per cell
+    confidence: Two-sided confidence level
+    seed: Random seed
+
+    <OUTPUTS>
+    One dict per cell: {provider, scenario, language, features, estimate, lower, upper}
+    where estimate/lower/upper are arrays aligned with features.
+    Role/sentiment intervals are conditional on the group being mentioned in the resample.
+    """
+    if not cells:
+        return []
+
+    rng = np.random.default_rng(seed)
+    alpha = (1 - confidence) / 2
+    lower: list[np.ndarray] = [None] * len(cells)
+    upper: list[np.ndarray] = [None] * len(cells)
+
+    widths = [max(len(c.features), c.n_samples) for c in cells]
+    for batch_indices in _width_batches(widths, resamples):
+        batch = [cells[i] for i in batch_indices]
+        num, den, n = _stack(batch)
+        weights = _resample_weights(rng, n, resamples, num.shape[1])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rates = np.matmul(weights, num) / np.matmul(weights, den)
+        # Role/sentiment shares are NaN in resamples where the group was never drawn
+        q = _nan_quantiles(rates, [alpha, 1 - alpha], axis=1)
+
+        for j, i in enumerate(batch_indices):
+            lower[i] = q[0, j, :len(cells[i].features)]
+            upper[i] = q[1, j, :len(cells[i].features)]
+
+    return [
+        {
+            "provider": c.provider,
+            "scenario": c.scenario,
+            "language": c.language,
+            "features": c.features,
+            "estimate": c.estimates(),
+            "lower": lower[i],
+            "upper": upper[i]
+        }
+        for i, c in enumerate(cells)
+    ]
+
+def _rate_columns(cell: CellMatrix) -> dict[tuple[str, str], int]:
+    return {(kind, group): i for i, (kind, group, _) in enumerate(cell.features) if kind in ("refusal_rate", "mention_rate")}
+
+def permutation_tests(
+        pairs: list[tuple[CellMatrix, CellMatrix]],
+        permutations: int = 5000,
+        seed: int = 0
+) -> list[dict]:
+    """
+    Two-sided permutation tests for refusal_rate and every group's mention_rate between paired cells.
+    All pairs and permutations are evaluated as batched matrix products.
+
+    <INPUTS>
+    pairs: (cell_a, cell_b) comparisons
+    permutations: Number of label permutations per pair
+    seed: Random seed
+
+    <OUTPUTS>
+    One row per (pair, feature) with rates, difference, p_value and Benjamini-Hochberg q_value
+    """
+    if not pairs:
+        return []
+
+    rng = np.random.default_rng(seed)
+
+    # Pool the two cells of each pair over the union of their rate features
+    feature_sets = []
+    for a, b in pairs:
+        cols_a, cols_b = _rate_columns(a), _rate_columns(b)
+        feature_sets.append((sorted(set(cols_a) | set(cols_b)), cols_a, cols_b))
+
+    n_a = np.array([a.n_samples for a, _ in pairs], dtype=np.int64)
+    n_b = np.array([b.n_samples for _, b in pairs], dtype=np.int64)
+    sum_a = [None] * len(pairs)
+    totals = [None] * len(pairs)
+    p_values = [None] * len(pairs)
+
+    widths = [max(len(f[0]), int(n_a[k] + n_b[k])) for k, f in enumerate(feature_sets)]
+    for batch in _width_batches(widths, min(permutations, 1000)):
+        m_max = int((n_a[batch] + n_b[batch]).max())
+        g_max = max(len(feature_sets[k][0]) for k in batch)
+
+        pooled = np.zeros((len(batch), m_max, g_max))
+        for row, k in enumerate(batch):
+            a, b = pairs[k]
+            features, cols_a, cols_b = feature_sets[k]
+            for j, feature in enumerate(features):
+                if feature in cols_a:
+                    pooled[row, :a.n_samples, j] = a.numerators[:, cols_a[feature]]
+                if feature in cols_b:
+                    pooled[row, a.n_samples:a.n_samples + b.n_samples, j] = b.numerators[:, cols_b[feature]]
+
+        na, nb = n_a[batch], n_b[batch]
+        batch_totals = pooled.sum(axis=1)
+        batch_sum_a = np.where((np.arange(m_max)[None, :] < na[:, None])[:, :, None], pooled, 0).sum(axis=1)
+        observed = batch_sum_a / na[:, None] - (batch_totals - batch_sum_a) / nb[:, None]
+
+        exceed = np.zeros((len(batch), g_max))
+        valid = np.arange(m_max)[None, None, :] < (na + nb)[:, None, None]
+        step = max(1, _CHUNK_ELEMENTS // (len(batch) * max(m_max, g_max)))
+        for start in range(0, permutations, step):
+            size = min(step, permutations - start)
+            # Random keys, padding pushed past every real sample; the n_a smallest keys form group a
+            keys = np.where(valid, rng.random((len(batch), size, m_max)), 2.0)
+            threshold = np.take_along_axis(np.sort(keys, axis=2), np.broadcast_to((na - 1)[:, None, None], (len(batch), size, 1)), axis=2)
+            perm_a = np.matmul((keys <= threshold).astype(np.float64), pooled)
+            diffs = perm_a / na[:, None, None] - (batch_totals[:, None, :] - perm_a) / nb[:, None, None]
+            exceed += (np.abs(diffs) >= np.abs(observed)[:, None, :] - 1e-12).sum(axis=1)
+
+        for row, k in enumerate(batch):
+            g = len(feature_sets[k][0])
+            sum_a[k] = batch_sum_a[row, :g]
+            totals[k] = batch_totals[row, :g]
+            p_values[k] = (exceed[row, :g] + 1) / (permutations + 1)
+
+    rows = []
+    for k, ((a, b), (features, _, _)) in enumerate(zip(pairs, feature_sets)):
+        rate_a = sum_a[k] / n_a[k]
+        rate_b = (totals[k] - sum_a[k]) / n_b[k]
+        for j, (kind, group) in enumerate(features):
+            rows.append({
+                "feature": kind,
+                "group": group,
+                "a": {"provider": a.provider, "scenario": a.scenario, "language": a.language, "rate": float(rate_a[j]), "samples": a.n_samples},
+                "b": {"provider": b.provider, "scenario": b.scenario, "language": b.language, "rate": float(rate_b[j]), "samples": b.n_samples},
+                "difference": float(rate_a[j] - rate_b[j]),
+                "p_value": float(p_values[k][j])
+            })
+
+    q_values = benjamini_hochberg(np.array([r["p_value"] for r in rows]))
+    for r, q in zip(rows, q_values):
+        r["q_value"] = float(q)
+    return rows
+
+def benjamini_hochberg(p_values: np.ndarray) -> np.ndarray:
+    """False discovery rate adjusted p-values"""
+    m = len(p_values)
+    if not m:
+        return p_values
+    order = np.argsort(p_values)
+    ranked = p_values[order] * m / np.arange(1, m + 1)
+    adjusted = np.minimum.accumulate(ranked[::-1])[::-1]
+    out = np.empty(m)
+    out[order] = np.minimum(adjusted, 1.0)
+    return out
+
+def language_pairs(cells: list[CellMatrix]) -> list[tuple[CellMatrix, CellMatrix]]:
+    """Every pair of languages within the same provider and scenario"""
+    by_key: dict = defaultdict(list)
+    for c in cells:
+        by_key[(c.provider, c.scenario)].append(c)
+    return [pair for group in by_key.values() for pair in combinations(sorted(group, key=lambda c: c.language), 2)]
+
+def provider_pairs(cells: list[CellMatrix]) -> list[tuple[CellMatrix, CellMatrix]]:
+    """Every pair of providers within the same scenario and language"""
+    by_key: dict = defaultdict(list)
+    for c in cells:
+        by_key[(c.scenario, c.language)].append(c)
+    return [pair for group in by_key.values() for pair in combinations(sorted(group, key=lambda c: c.provider), 2)]
+
+def _interval(lower: float, upper: float) -> Optional[list[float]]:
+    if np.isnan(lower) or np.isnan(upper):
+        return None
+    return [float(lower), float(upper)]
+
+def annotate_stats_with_intervals(
+        stats: dict,
+        results: list[AnnotatedResponse],
+        resamples: int = 1000,
+        confidence: float = 0.95,
+        seed: int = 0
+):
+    """
+    Add bootstrap intervals to the output of compute_statistics() in place:
+    refusal_rate_ci per cell, and mention_rate_ci, role_distribution_ci and sentiment_distribution_ci per group
+
+    <INPUTS>
+    stats: Output of compute_statistics()
+    results: The results the statistics were computed from
+    resamples: Number of bootstrap resamples
+    confidence: Two-sided confidence level
+    seed: Random seed
+    """
+    for cell in bootstrap_intervals(encode_cells(results), resamples=resamples, confidence=confidence, seed=seed):
+        cell_stats = stats.get(cell["scenario"], {}).get(cell["language"])
+        if cell_stats is None:
+            continue
+
+        for (kind, group, label), lo, hi in zip(cell["features"], cell["lower"], cell["upper"]):
+            if kind == "refusal_rate":
+                cell_stats["refusal_rate_ci"] = _interval(lo, hi)
+                continue
+
+            group_stats = cell_stats["groups"].get(group)
+            if group_stats is None:
+                continue
+            if kind == "mention_rate":
+                group_stats["mention_rate_ci"] = _interval(lo, hi)
+            elif kind == "role":
+                group_stats.setdefault("role_distribution_ci", {})[label] = _interval(lo, hi)
+            elif kind == "sentiment":
+                group_stats.setdefault("sentiment_distribution_ci", {})[label] = _interval(lo, hi)
+
+def _interval_rows(intervals: list[dict]) -> list[dict]:
+    return [
+        {
+            "provider": cell["provider"],
+            "scenario": cell["scenario"],
+            "language": cell["language"],
+            "feature": kind,
+            "group": group,
+            "label": label,
+            "estimate": None if np.isnan(est) else float(est),
+            "ci": _interval(lo, hi)
+        }
+        for cell in intervals
+        for (kind, group, label), est, lo, hi in zip(cell["features"], cell["estimate"], cell["lower"], cell["upper"])
+    ]
+
+def main():
+    from utilities.utility_functions import load_results
+
+    parser = argparse.ArgumentParser(description="Bootstrap intervals and cross-language/provider permutation tests")
+    parser.add_argument("files", nargs="+", help="Output JSON files, one per target model")
+    parser.add_argument("--resamples", type=int, default=2000)
+    parser.add_argument("--permutations", type=int, default=5000)
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--alpha", type=float, default=0.05, help="FDR level for the printed significant differences")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Optional path to write the full report as JSON")
+    args = parser.parse_args()
+
+    cells: list[CellMatrix] = []
+    for path in args.files:
+        metadata, results = load_results(path)
+        cells.extend(encode_cells(results, provider=metadata.get("target_model", {}).get("name", path)))
+    print(f"Encoded {len(cells):,} cells from {len(args.files)} file(s)")
+
+    start = time.perf_counter()
+    intervals = bootstrap_intervals(cells, resamples=args.resamples, confidence=args.confidence, seed=args.seed)
+    print(f"Bootstrap ({args.resamples:,} resamples): {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    language_tests = permutation_tests(language_pairs(cells), permutations=args.permutations, seed=args.seed)
+    provider_tests = permutation_tests(provider_pairs(cells), permutations=args.permutations, seed=args.seed)
+    print(f"Permutation tests ({args.permutations:,} permutations): {time.perf_counter() - start:.2f}s")
+
+    for title, tests in (("LANGUAGE", language_tests), ("PROVIDER", provider_tests)):
+        significant = sorted((t for t in tests if t["q_value"] < args.alpha), key=lambda t: t["q_value"])
+        print(f"\n{title} DIFFERENCES: {len(significant):,} of {len(tests):,} significant at FDR {args.alpha}")
+        for t in significant[:50]:
+            a, b = t["a"], t["b"]
+            label = "refusal_rate" if t["feature"] == "refusal_rate" else f"{t['group']} mention_rate"
+            side_a = a["language"] if title == "LANGUAGE" else a["provider"]
+            side_b = b["language"] if title == "LANGUAGE" else b["provider"]
+            print(f"     {a['scenario']} | {label}: {side_a}={a['rate']:.1%} vs {side_b}={b['rate']:.1%}, q={t['q_value']:.4f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "intervals": _interval_rows(intervals),
+                "language_tests": language_tests,
+                "provider_tests": provider_tests
+            }, f, indent=2, ensure_ascii=False)
+        print(f"Report written to {args.output}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,12 +5,22 @@ import time
 import sys
 from datetime import datetime
 from typing import Optional
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import SimpleNamespace
 
 # Data structure imports
 from utilities.data_structures import AnnotatedResponse
 from utilities.Tee import Tee
+from utilities.significance import annotate_stats_with_intervals
+from utilities.agreement import annotate_stats_with_agreement
+from utilities.CircuitBreaker import CircuitOpenError
+from utilities.output_index import OutputIndex
+from utilities.near_duplicates import NearDuplicateIndex
+from utilities.Tracer import tracer
+from utilities.ProgressReporter import ProgressReporter
+from utilities.BlobStore import BlobStore
 
 # Email sending
 from utilities.EmailNotifier import EmailNotifer
@@ -22,6 +32,7 @@ from models.DeepSeekExperiment import DeepSeekExperiment
 from models.GeminiExperiment import GeminiExperiment
 from models.GrokExperiment import GrokExperiment
 
+@tracer.traced("run_experiments")
 def run_experiments(
       model: ClaudeExperiment | ChatGPTExperiment | DeepSeekExperiment | GeminiExperiment | GrokExperiment,
 
@@ -38,6 +49,13 @@ def run_experiments(
 
       scenarios: Optional[list[str]] = None,
       languages: Optional[list[str]] = None,
+
+      rate_limit_delay: float = 0.5,
+      max_hold: float = 3600.0,
+      generation_batch_size: int = 1,
+      dedup_threshold: Optional[float] = None,
+      progress_dir: Optional[str] = None,
+      blob_store: Optional[BlobStore] = None,
   ) -> list[AnnotatedResponse]:
     """
     Run the full experiment across the specified scenarios and languages
@@ -53,6 +71,12 @@ def run_experiments(
     output_filename: Name of file with final results
     scenarios: subset of SCENARIO_PROMPTS keys. Defaults to all
     langauges: subset of langauge codes. Defaults to all available
+    rate_limit_delay: Seconds to sleep after each sample. Default: 0.5
+    max_hold: Seconds to wait for a provider whose circuit is open before giving up on its held work. Default: 3600
+    generation_batch_size: Responses generated per request (or parallel calls where the provider has no multi-completion request), mapped onto consecutive sample indices. Default: 1
+    dedup_threshold: When set, a response whose estimated similarity to an earlier response in the same scenario and language reaches this reuses that response's classifications instead of being classified. Default: None
+    progress_dir: Directory to publish live progress to as <prefix>.json, read by dashboard.py. Default: None
+    blob_store: Store the output's long texts here and refer to them by digest. Default: None (inline)
     """
 
     # Setup logging if logging filepath was provided
@@ -66,64 +90,190 @@ def run_experiments(
       sys.stdout = tee
       print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [LOG] Session started")
 
+    progress = None
+    progress_status = "failed"
     try:
       print(model)
 
+      # Classifiers are shared across models, so count parse failures per run
+      for classifier in classifiers:
+        classifier.reset_counters()
+
       target_scenarios = scenarios or list(model.scenario_prompts.keys())
       results: list[AnnotatedResponse] = []
 
-      for scenario in target_scenarios:
-        prompt_bank = model.scenario_prompts[scenario]
-        target_languages = languages or list(prompt_bank.keys())
-
-        for language in target_languages:
-          if language not in prompt_bank:
-            print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [EXPERIMENT] No prompt for scenario={scenario}, lang={language}")
+      total_samples = sum(
+        1
+        for scenario in target_scenarios
+        for language in (languages or list(model.scenario_prompts[scenario].keys()))
+        if language in model.scenario_prompts[scenario]
+      ) * model.samples_per_prompt
+      progress = ProgressReporter(progress_dir, prefix, model.target_model, total_samples)
+
+      # Results waiting on a classifier whose circuit is open, per classifier
+      held: dict[int, deque[AnnotatedResponse]] = defaultdict(deque)
+
+      # Samples whose refusal is reported once their classifications are filled in, as (sample results, results
+      # they wait on). Held samples wait on themselves, near-duplicates on their representative and resolve_reused
+      unreported: list[tuple[list[AnnotatedResponse], list[AnnotatedResponse]]] = []
+
+      def report_classified(reused_resolved: bool = False):
+        still_held = {id(r) for queue in held.values() for r in queue}
+        for entry in list(unreported):
+          sample_results, sources = entry
+          if sample_results[0].reused_from is not None and not reused_resolved:
             continue
-
-          notifier.notify_update(
-            prefix=prefix,
-            model=model.target_model,
-            scenario=scenario,
-            lang=language
-          )
-
-          prompt = prompt_bank[language]
-          print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [EXPERIMENT] Scenario: {scenario} | Language: {language}")
-
-          for i in range(model.samples_per_prompt):
-            print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [EXPERIMENT] Sample {i+1}/{model.samples_per_prompt}")
-
-            # Step 1: Generate response
-            response_text = model.generate_response(prompt, i)
-
-            # Step 2: Classify with each classifier
-            for classifier in classifiers:
-              groups, roles, sentiment, notes, is_refusal, raw = ([], {}, {}, "", False, "")
-              if response_text:
-                groups, roles, sentiment, notes, is_refusal, raw = classifier.classify_response(response_text)
-
-              annotated = AnnotatedResponse(
-                  classifier=classifier.target_model,
-                  scenario=scenario,
-                  language=language,
-                  sample_index=i,
-                  raw_response=response_text,
-                  groups_mentioned=groups,
-                  roles=roles,
-                  sentiment=sentiment,
-                  notes=notes,
-                  is_refusal=is_refusal,
-                  classifier_raw=raw
-              )
-              results.append(annotated)
-              print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [EXPERIMENT] Classifier: {classifier.target_model} | Groups found: {groups or 'none'} | Refusal: {is_refusal}")
-
-            # Rate limiting
-            time.sleep(0.5)
+          if any(id(r) in still_held for r in sources):
+            continue
+          unreported.remove(entry)
+          progress.sample_classified(refusal=any(r.is_refusal for r in sample_results))
+
+      try:
+        for scenario in target_scenarios:
+          prompt_bank = model.scenario_prompts[scenario]
+          target_languages = languages or list(prompt_bank.keys())
+
+          for language in target_languages:
+            if language not in prompt_bank:
+              print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [EXPERIMENT] No prompt for scenario={scenario}, lang={language}")
+              continue
+
+            notifier.notify_update(
+              prefix=prefix,
+              model=model.target_model,
+              scenario=scenario,
+              lang=language
+            )
+
+            prompt = prompt_bank[language]
+            print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [EXPERIMENT] Scenario: {scenario} | Language: {language}")
+            progress.cell_started(scenario, language)
+
+            # Near-duplicates of an earlier response in this cell reuse its classifications
+            dedup = NearDuplicateIndex(threshold=dedup_threshold) if dedup_threshold else None
+            cell_results: dict[int, list[AnnotatedResponse]] = {}
+
+            batch: list[Optional[str]] = []
+            for i in range(model.samples_per_prompt):
+              print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [EXPERIMENT] Sample {i+1}/{model.samples_per_prompt}")
+
+              # Step 1: Generate response, a batch at a time for samples i .. i + generation_batch_size - 1
+              if generation_batch_size > 1 and i % generation_batch_size == 0:
+                batch = model.generate_responses(prompt, i, min(generation_batch_size, model.samples_per_prompt - i))
+              response_text = batch[i % generation_batch_size] if generation_batch_size > 1 else None
+              if response_text is None:
+                # Not batched, or held by an open circuit
+                response_text = generate_when_available(model, prompt, i, classifiers, held, max_hold)
+
+              reused = None
+              if dedup is not None and response_text:
+                with tracer.span("dedup", "experiment", sample=i):
+                  reused = dedup.add(i, response_text)
+              if reused:
+                print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [DEDUP] Near-duplicate of sample {reused[0]+1} (similarity {reused[1]:.2f}), reusing its classifications")
+
+              # Step 2: Classify with each classifier
+              waiting = bool(reused)
+              for c, classifier in enumerate(classifiers):
+                annotated = AnnotatedResponse(
+                    classifier=classifier.target_model,
+                    scenario=scenario,
+                    language=language,
+                    sample_index=i,
+                    raw_response=response_text,
+                    groups_mentioned=[],
+                    roles={},
+                    sentiment={},
+                    notes="",
+                    is_refusal=False,
+                    classifier_raw="",
+                    reused_from=reused[0] if reused else None
+                )
+                results.append(annotated)
+
+                # Filled in from the representative once every classification is in
+                if reused:
+                  continue
+
+                if response_text:
+                  # Queue behind earlier held work so it is classified in order
+                  if held[c]:
+                    held[c].append(annotated)
+                    waiting = True
+                    continue
+                  try:
+                    failures = classifier.call_failures
+                    with progress.classifier_call():
+                      classify_into(classifier, annotated)
+                    progress.classifier_done(failed=classifier.call_failures > failures)
+                  except CircuitOpenError as e:
+                    annotated.classifier_raw = str(e)
+                    held[c].append(annotated)
+                    waiting = True
+                    print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [CIRCUIT] Holding classification for {classifier.target_model}: {e}")
+                    continue
+                print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [EXPERIMENT] Classifier: {classifier.target_model} | Groups found: {annotated.groups_mentioned or 'none'} | Refusal: {annotated.is_refusal}")
+
+              # Resume held work for any classifier that is ready to probe
+              drain_held(classifiers, held)
+
+              progress.sample_done(generation_failed=not response_text)
+              if response_text and classifiers:
+                sample_results = results[-len(classifiers):]
+                cell_results[i] = sample_results
+                if waiting:
+                  unreported.append((sample_results, cell_results[reused[0]] if reused else sample_results))
+                else:
+                  progress.sample_classified(refusal=any(r.is_refusal for r in sample_results))
+              if unreported:
+                report_classified()
+              progress.set_held(sum(len(queue) for queue in held.values()))
+
+              # Rate limiting
+              if rate_limit_delay:
+                with tracer.span("rate_limit_sleep", "sleep"):
+                  time.sleep(rate_limit_delay)
+        progress_status = "finished"
+      except CircuitOpenError as e:
+        progress_status = "stopped"
+        print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [CIRCUIT] {model.target_model} still unavailable after {max_hold:.0f}s, stopping and saving partial results: {e}")
+
+      # Wait for classifiers that are still down, up to max_hold
+      deadline = time.monotonic() + max_hold
+      while any(held.values()) and time.monotonic() < deadline:
+        wait = min(classifiers[c].breaker.seconds_until_probe() for c, queue in held.items() if queue)
+        with tracer.span("circuit_wait", "sleep"):
+          time.sleep(min(max(wait, 0.1), max(deadline - time.monotonic(), 0)))
+        drain_held(classifiers, held)
+        report_classified()
+        progress.set_held(sum(len(queue) for queue in held.values()))
+
+      for c, queue in held.items():
+        if queue:
+          print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [CIRCUIT] {classifiers[c].target_model} | {len(queue)} samples left unclassified")
+
+      if dedup_threshold:
+        reused_count = resolve_reused(results)
+        print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [DEDUP] Reused classifications for {reused_count // max(len(classifiers), 1)} samples")
+      # Samples still held are left out of the refusal rate
+      report_classified(reused_resolved=True)
+
+      # Classifier health for this run
+      for classifier in classifiers:
+        print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [CLASSIFIER] {classifier.target_model} | "
+              f"Calls: {classifier.classify_calls} | Call failures: {classifier.call_failures} | "
+              f"Parse failures: {classifier.parse_failures} ({classifier.parse_failure_rate():.1%})")
+        if classifier.hedging:
+          hedge_stats = classifier.hedging.report().get(classifier.latency_key())
+          if hedge_stats:
+            print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [HEDGING] {classifier.target_model} | "
+                  f"Hedges: {hedge_stats['hedges']}/{hedge_stats['calls']} | Hedge wins: {hedge_stats['hedge_wins']}")
 
       # Compute statistics (aggregated across all classifiers)
-      stats = compute_statistics(results)
+      with tracer.span("statistics", "stats"):
+        stats = compute_statistics(results)
+        annotate_stats_with_intervals(stats, results)
+        agreement = annotate_stats_with_agreement(stats, results)
 
       # Print stats
       print_summary(stats)
@@ -136,17 +286,134 @@ def run_experiments(
         filename=output_filename,
         model=model,
         classifiers=classifiers,
+        agreement=agreement,
+        blob_store=blob_store
       )
+
+      return results
     except Exception as e:
       print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [EXPERIMENT] Exception: {e}")
       raise e
     finally:
+      if progress:
+        progress.close(progress_status)
+
       # Always restore stdout
       if tee:
         print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [LOG] Session ended")
         sys.stdout = tee.terminal
         tee.close()
 
+def classify_into(classifier: ClaudeExperiment | ChatGPTExperiment | DeepSeekExperiment | GeminiExperiment | GrokExperiment, annotated: AnnotatedResponse):
+  """
+  Classify annotated.raw_response and fill in its classification fields
+
+  Raises CircuitOpenError, leaving annotated untouched, while the classifier's circuit is open
+  """
+  with tracer.span("classify", "classifier", model=classifier.target_model, sample=annotated.sample_index):
+    groups, roles, sentiment, notes, is_refusal, raw = classifier.classify_response(annotated.raw_response)
+  annotated.groups_mentioned = groups
+  annotated.roles = roles
+  annotated.sentiment = sentiment
+  annotated.notes = notes
+  annotated.is_refusal = is_refusal
+  annotated.classifier_raw = raw
+
+def resolve_reused(results: list[AnnotatedResponse]) -> int:
+  """
+  Copy each representative's classification onto the near-duplicates that reuse it
+
+  <OUTPUTS>
+  Number of results filled in
+  """
+  representatives = {
+    (r.classifier, r.scenario, r.language, r.sample_index): r
+    for r in results if r.reused_from is None
+  }
+
+  filled = 0
+  for r in results:
+    if r.reused_from is None:
+      continue
+    source = representatives.get((r.classifier, r.scenario, r.language, r.reused_from))
+    if source is None:
+      continue
+    r.groups_mentioned = list(source.groups_mentioned)
+    r.roles = dict(source.roles)
+    r.sentiment = dict(source.sentiment)
+    r.notes = source.notes
+    r.is_refusal = source.is_refusal
+    r.classifier_raw = source.classifier_raw
+    filled += 1
+  return filled
+
+def drain_held(
+    classifiers: list[ClaudeExperiment | ChatGPTExperiment | DeepSeekExperiment | GeminiExperiment | GrokExperiment],
+    held: dict[int, deque[AnnotatedResponse]]
+  ):
+  """
+  Classify held results in order for each classifier whose circuit lets calls through.
+  Stops at the first held call for a classifier that is still (or again) open.
+
+  <INPUTS>
+  classifiers: Classifiers used in the run
+  held: Classifier index to the results waiting on it
+  """
+  for c, queue in held.items():
+    if not queue:
+      continue
+
+    classifier = classifiers[c]
+    drained = 0
+    while queue:
+      try:
+        classify_into(classifier, queue[0])
+      except CircuitOpenError:
+        break
+      # A failed probe re-opens the circuit, keep the sample held for the next one
+      if classifier.breaker.state == classifier.breaker.OPEN:
+        break
+      queue.popleft()
+      drained += 1
+
+    if drained:
+      print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [CIRCUIT] {classifier.target_model} | Resumed {drained} held samples, {len(queue)} still held")
+
+def generate_when_available(
+    model: ClaudeExperiment | ChatGPTExperiment | DeepSeekExperiment | GeminiExperiment | GrokExperiment,
+    prompt: str,
+    sample_index: int,
+    classifiers: list[ClaudeExperiment | ChatGPTExperiment | DeepSeekExperiment | GeminiExperiment | GrokExperiment],
+    held: dict[int, deque[AnnotatedResponse]],
+    max_hold: float
+  ) -> str:
+  """
+  Generate a response, waiting for the target model's circuit to half-open while it is open.
+  Held classifier work is drained while waiting.
+
+  Raises CircuitOpenError when the target model stays unavailable for longer than max_hold
+  """
+  waited_since = None
+  while True:
+    try:
+      response_text = model.generate_response(prompt, sample_index)
+      # A failed probe re-opens the circuit, keep waiting instead of recording an empty sample
+      if response_text or waited_since is None or model.breaker.state != model.breaker.OPEN:
+        return response_text
+      retry_in = model.breaker.seconds_until_probe()
+    except CircuitOpenError as e:
+      retry_in = e.retry_in
+      if waited_since is None:
+        waited_since = time.monotonic()
+        print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [CIRCUIT] Holding generation for {model.target_model}: {e}")
+
+    if time.monotonic() - waited_since + retry_in > max_hold:
+      raise CircuitOpenError(model.latency_key(), retry_in)
+
+    drain_held(classifiers, held)
+    with tracer.span("circuit_wait", "sleep"):
+      time.sleep(max(retry_in, 0.1))
+
 def compute_statistics(results: list[AnnotatedResponse]) -> dict:
   """
   Compute distributional statistics from annotated results, aggregated across all classifiers.
@@ -268,6 +535,7 @@ def print_summary(stats: dict):
               f"classifier_agreement={gdata['classifier_agreement']:.1%}, "
               f"top_role={top_role}, top_sentiment={top_sent}")
 
+@tracer.traced("save_results", "io")
 def save_results(
     results: list[AnnotatedResponse],
     stats: dict,
@@ -275,7 +543,10 @@ def save_results(
     filename: str,
     model: ClaudeExperiment | ChatGPTExperiment | DeepSeekExperiment | GeminiExperiment | GrokExperiment,
     classifiers: list[ClaudeExperiment | ChatGPTExperiment | DeepSeekExperiment | GeminiExperiment | GrokExperiment],
-    indent: int = 2
+    agreement: Optional[dict] = None,
+    indent: int = 2,
+    previous_classifiers: Optional[list[dict]] = None,
+    blob_store: Optional[BlobStore] = None
 ):
   """
   Serialize experiment results and write to JSON file
@@ -287,7 +558,10 @@ def save_results(
   filename: Output filename (.json appended if missing)
   model: The model object tested
   classifiers: List of classifier models used
+  agreement: Global inter-classifier agreement from annotate_stats_with_agreement(). Default: None
   indent: JSON indentation level. Default: 2
+  previous_classifiers: classifier_models entries carried over from a loaded output, listed first. Default: None
+  blob_store: Write responses, raw classifier outputs and classifier system prompts to this store and keep only their digests in the JSON. Default: None
   """
 
   # Make sure file name ends with .json
@@ -328,7 +602,8 @@ def save_results(
             "sentiment": r.sentiment,
             "notes": r.notes,
             "is_refusal": r.is_refusal,
-            "classifier_raw": r.classifier_raw
+            "classifier_raw": r.classifier_raw,
+            "reused_from": r.reused_from
           }
           for r in annotations
         ]
@@ -343,9 +618,14 @@ def save_results(
         {
           "group": group,
           "mention_rate": gdata["mention_rate"],
+          "mention_rate_ci": gdata.get("mention_rate_ci"),
           "classifier_agreement": gdata["classifier_agreement"],
           "top_role": max(gdata["role_distribution"], key=gdata["role_distribution"].get, default="-"),
-          "top_sentiment": max(gdata["sentiment_distribution"], key=gdata["sentiment_distribution"].get, default="-")
+          "top_sentiment": max(gdata["sentiment_distribution"], key=gdata["sentiment_distribution"].get, default="-"),
+          "role_distribution": gdata["role_distribution"],
+          "role_distribution_ci": gdata.get("role_distribution_ci"),
+          "sentiment_distribution": gdata["sentiment_distribution"],
+          "sentiment_distribution_ci": gdata.get("sentiment_distribution_ci")
         }
         for group, gdata in language_stats.get("groups", {}).items()
       ]
@@ -355,6 +635,8 @@ def save_results(
         "responses": serialized_responses,
         "stats": {
           "refusal_rate": language_stats.get("refusal_rate", 0.0),
+          "refusal_rate_ci": language_stats.get("refusal_rate_ci"),
+          "agreement": language_stats.get("agreement"),
           "groups": groups_summary
         }
       })
@@ -371,19 +653,222 @@ def save_results(
       "temperature": model.target_model_temperature,
       "max_tokens": model.target_model_max_tokens
     },
-    "classifier_models": [
+    "classifier_models": (previous_classifiers or []) + [
       {
         "name": c.target_model,
         "temperature": c.target_model_temperature,
         "max_tokens": c.target_model_max_tokens,
-        "system": c.system_prompt
+        "system": c.system_prompt,
+        "classify_calls": c.classify_calls,
+        "call_failures": c.call_failures,
+        "parse_failures": c.parse_failures,
+        "parse_failure_rate": c.parse_failure_rate()
       }
       for c in classifiers
     ],
+    "agreement": agreement,
     "scenarios": scenarios
   }
 
+  if blob_store:
+    output = blob_store.pack_output(output, output_dir)
+
   with open(output_path, "w", encoding="utf-8") as f:
     json.dump(output, f, indent=indent, ensure_ascii=False)
 
-  print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [SAVE] Results written to {output_path}")
\ No newline at end of file
+  print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [SAVE] Results written to {output_path}")
+
+def load_results(path: str, partial: bool = False, resolve_blobs: bool = True) -> tuple[dict, list[AnnotatedResponse]]:
+  """
+  Load an output JSON written by save_results back into AnnotatedResponse objects
+
+  <INPUTS>
+  path: Path to the output JSON
+  partial: If the file is truncated, load its metadata and complete samples (through the byte-offset
+           index) instead of raising. Default: False
+  resolve_blobs: Replace blob store digests with their texts. With False they are left as digests, to be
+                 resolved on demand with BlobStore.for_output(path).resolve(). Default: True
+
+  <OUTPUTS>
+  (metadata, results) where metadata is every top level key except "scenarios"
+  """
+  try:
+    with open(path, "r", encoding="utf-8") as f:
+      data = json.load(f)
+  except json.JSONDecodeError:
+    if not partial:
+      raise
+    index = OutputIndex.open(path)
+    print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [LOAD] {path} is truncated, loading its {len(index):,} complete samples")
+
+    # The metadata is written before "scenarios", so it survives the truncation
+    data = {}
+    with open(path, "r", encoding="utf-8") as f:
+      head = f.read()
+    header_end = head.find('"scenarios":')
+    if header_end != -1:
+      try:
+        data = json.loads(head[:header_end] + '"scenarios": []}')
+      except json.JSONDecodeError:
+        data = {}
+    data["scenarios"] = []
+    scenario_entries: dict[str, dict] = {}
+    language_entries: dict[tuple[str, str], dict] = {}
+    for (scenario, language, _), response in index.iter_samples():
+      if scenario not in scenario_entries:
+        scenario_entries[scenario] = {"scenario": scenario, "languages": []}
+        data["scenarios"].append(scenario_entries[scenario])
+      if (scenario, language) not in language_entries:
+        language_entries[(scenario, language)] = {"language": language, "responses": []}
+        scenario_entries[scenario]["languages"].append(language_entries[(scenario, language)])
+      language_entries[(scenario, language)]["responses"].append(response)
+
+  store = BlobStore.for_output(path, header=data if "blob_store" in data else None)
+  if store and resolve_blobs:
+    store.unpack_output(data)
+
+  results: list[AnnotatedResponse] = []
+  for scenario_entry in data.get("scenarios", []):
+    for language_entry in scenario_entry.get("languages", []):
+      for response in language_entry.get("responses", []):
+        for c in response.get("classifiers", []):
+          results.append(AnnotatedResponse(
+            classifier=c.get("classifier", ""),
+            scenario=scenario_entry["scenario"],
+            language=language_entry["language"],
+            sample_index=response["sample_index"],
+            raw_response=response.get("raw_response", ""),
+            groups_mentioned=c.get("groups_mentioned", []),
+            roles=c.get("roles", {}),
+            sentiment=c.get("sentiment", {}),
+            notes=c.get("notes", ""),
+            is_refusal=c.get("is_refusal", False),
+            classifier_raw=c.get("classifier_raw", ""),
+            reused_from=c.get("reused_from")
+          ))
+
+  metadata = {k: v for k, v in data.items() if k != "scenarios"}
+  return metadata, results
+
+def reclassify_outputs(
+      paths: list[str],
+      classifiers: list[ClaudeExperiment | ChatGPTExperiment | DeepSeekExperiment | GeminiExperiment | GrokExperiment],
+      output_dir: Optional[str] = None,
+      concurrency: int = 4,
+      max_hold: float = 3600.0
+  ) -> list[str]:
+  """
+  Run classifiers over the stored responses of existing outputs without calling any target model.
+  Each input gets a new output next to it (or in output_dir) named <input>_reclassified_<timestamp>.json,
+  with the new classifier entries merged in, replacing earlier entries from the same classifier models,
+  and the statistics recomputed.
+
+  <INPUTS>
+  paths: Output JSONs written by save_results. Truncated files contribute their complete samples
+  classifiers: Classifiers to run
+  output_dir: Directory for the new outputs. Defaults to each input's directory
+  concurrency: Requests in flight per classifier. Default: 4
+  max_hold: Seconds to wait for a classifier whose circuit is open before giving up on a sample. Default: 3600
+
+  <OUTPUTS>
+  Paths of the new outputs
+  """
+  written = []
+  names = {c.target_model for c in classifiers}
+
+  for path in paths:
+    metadata, previous = load_results(path, partial=True)
+    kept = [r for r in previous if r.classifier not in names]
+
+    # One stored response per sample, in file order
+    samples: dict[tuple[str, str, int], str] = {}
+    for r in previous:
+      samples.setdefault((r.scenario, r.language, r.sample_index), r.raw_response)
+    print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [RECLASSIFY] {path} | Samples: {len(samples):,} | Classifiers: {sorted(names)}")
+
+    for classifier in classifiers:
+      classifier.reset_counters()
+
+    def classify(classifier, key: tuple[str, str, int], text: str) -> AnnotatedResponse:
+      annotated = AnnotatedResponse(
+        classifier=classifier.target_model,
+        scenario=key[0],
+        language=key[1],
+        sample_index=key[2],
+        raw_response=text,
+        groups_mentioned=[],
+        roles={},
+        sentiment={},
+        notes="",
+        is_refusal=False,
+        classifier_raw=""
+      )
+      if not text:
+        return annotated
+
+      waited = 0.0
+      while True:
+        try:
+          classify_into(classifier, annotated)
+          return annotated
+        except CircuitOpenError as e:
+          if waited + e.retry_in > max_hold:
+            annotated.classifier_raw = str(e)
+            return annotated
+          time.sleep(max(e.retry_in, 0.1))
+          waited += max(e.retry_in, 0.1)
+
+    # Every classifier runs at once, each through its own bounded pool
+    pools = [ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=c.target_model) for c in classifiers]
+    try:
+      futures = [
+        pool.submit(classify, classifier, key, text)
+        for classifier, pool in zip(classifiers, pools)
+        for key, text in samples.items()
+      ]
+      added = [future.result() for future in futures]
+    finally:
+      for pool in pools:
+        pool.shutdown(wait=True)
+
+    # Keep samples together, in their original order, with earlier classifiers first
+    order = {key: i for i, key in enumerate(samples)}
+    results = sorted(kept + added, key=lambda r: order[(r.scenario, r.language, r.sample_index)])
+
+    for classifier in classifiers:
+      print(f"{datetime.now().strftime('%m/%d/%Y %H:%M:%S')} [CLASSIFIER] {classifier.target_model} | "
+            f"Calls: {classifier.classify_calls} | Call failures: {classifier.call_failures} | "
+            f"Parse failures: {classifier.parse_failures} ({classifier.parse_failure_rate():.1%})")
+
+    with tracer.span("statistics", "stats"):
+      stats = compute_statistics(results)
+      annotate_stats_with_intervals(stats, results)
+      agreement = annotate_stats_with_agreement(stats, results)
+
+    # save_results only reads these attributes of the target model
+    target = metadata.get("target_model", {})
+    model = SimpleNamespace(
+      samples_per_prompt=metadata.get("samples_per_prompt", max((r.sample_index for r in results), default=-1) + 1),
+      target_model=target.get("name", ""),
+      target_model_temperature=target.get("temperature"),
+      target_model_max_tokens=target.get("max_tokens")
+    )
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    filename = f"{stem}_reclassified_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    directory = output_dir or os.path.dirname(path)
+    save_results(
+      results=results,
+      stats=stats,
+      output_dir=directory,
+      filename=filename,
+      model=model,
+      classifiers=classifiers,
+      agreement=agreement,
+      previous_classifiers=[c for c in metadata.get("classifier_models", []) if c.get("name") not in names],
+      # Packed outputs stay packed
+      blob_store=BlobStore.for_output(path)
+    )
+    written.append(os.path.join(directory, filename + ".json"))
+
+  return written